@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Benchmark the prompt and payload tooling against synthetic, scaled inputs.
+
+For each scale factor a throwaway repository tree is generated:
+  - prompts/: every prompt update_prompts.py processes, copied `scale` times
+    (copies are named <stem>-x<n>.json; excluded files stay single), with
+    its directives stripped so every file has work to do, and padded to
+    20-50 KB with lines from its own body.
+    Anchors (STEP n —, the Excel headings) are left where they were, and the
+    file-specific rules are retargeted at the copies with a --rules file.
+  - data/: every catalogue's top-level items (industries, objective types,
+    domains, categories, partners, industry groups) copied `scale` times, so
+    the data grows linearly with the scale. bench/render.html also multiplies
+    the leaf options, which suits the form but would grow the data by scale².
+  - index.html / index-standalone.html: copies of the real entry points.
+
+Then it measures, `--runs` times each:
+  process_file      update_prompts.process_file over the whole pack
+  main (cold)       update_prompts.main on a fresh copy of the pack
+  main (warm)       the same again, when every rule is already applied
+  json load         json.load of every prompt and data file
+  build (cold)      build_html.build(force=True) with an empty fragment cache
+  build (warm)      build_html.build() with nothing stale
+plus the peak traced memory of one extra run of each (tracemalloc), and the
+raw and gzip size of every generated INLINED_* payload.
+
+Results are written as JSON and compared with a stored baseline; any
+median time, peak memory or payload size more than --threshold above the
+baseline is reported as a regression and the exit status is 1.
+
+Usage:
+  python bench/tooling.py                          # scales 10 and 100
+  python bench/tooling.py --scales 10,50,100 --runs 5
+  python bench/tooling.py --save-baseline          # record bench/baseline/tooling.json
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+
+import build_html  # noqa: E402
+import update_prompts  # noqa: E402
+
+BASELINE_PATH = REPO_ROOT / 'bench' / 'baseline' / 'tooling.json'
+RESULTS_DIR = REPO_ROOT / 'bench' / 'results'
+RESULTS_VERSION = 1
+
+MIN_INSTRUCTION_BYTES = 20_000
+MAX_INSTRUCTION_BYTES = 50_000
+# Filler lines must not create an earlier match for any anchor the rules use.
+ANCHOR_TEXT = ('STEP ', 'EXCEL WORKBOOK STRUCTURE', 'PWC FORMATTING STANDARDS FOR EXCEL',
+               'ENGAGEMENT CONTEXT', 'CONTEXT CHECK')
+HTML_TARGETS = tuple(build_html.TARGETS)
+
+
+# ── Synthetic inputs ─────────────────────────────────────────────────────────
+
+def times(items, scale, rename):
+    """items repeated `scale` times; copies after the first are renamed with their copy number."""
+    return [item if copy == 0 else rename(item, copy + 1) for copy in range(scale) for item in items]
+
+
+def named(field):
+    return lambda item, n: dict(item, **{field: f'{item[field]} {n}'})
+
+
+def scaled_data(scale):
+    """{file name: scaled JSON} for every data source."""
+    out = {}
+    for key, name in build_html.DATA_SOURCES.items():
+        with (build_html.DATA_DIR / name).open('r', encoding='utf-8') as fh:
+            data = json.load(fh)
+        if key in build_html.SEARCH_CATALOGUES:
+            root_keys, levels = build_html.SEARCH_CATALOGUES[key]
+            parent = data
+            for root_key in root_keys[:-1]:
+                parent = parent[root_key]
+            parent[root_keys[-1]] = times(parent[root_keys[-1]], scale, named(levels[0][0]))
+        elif key == 'industries':
+            data['industries'] = times(data['industries'], scale, named('industry'))
+        elif key == 'objectives':
+            types = data['engagement_objectives']
+            types['objective_types'] = times(types['objective_types'], scale, named('objective_type'))
+        out[name] = data
+    return out
+
+
+def strip_directives(inst, artifact):
+    """The instruction with every rule's payload removed, as it was before update_prompts ran."""
+    for r in update_prompts.RULES:
+        payload = r['payload'].replace('{artifact}', artifact)
+        inst = inst.replace('\n' + payload if r['position'] == 'after_line' else payload, '', 1)
+    return inst
+
+
+def synthetic_prompt(data, artifact, rng):
+    """The prompt with its directives stripped and padded to a realistic size."""
+    data = dict(data)
+    data.pop('applied_transforms', None)
+    inst = strip_directives(data['instruction'], artifact)
+    filler = [line for line in inst.split('\n')
+              if line.strip() and not any(anchor in line for anchor in ANCHOR_TEXT)]
+    target = rng.randint(MIN_INSTRUCTION_BYTES, MAX_INSTRUCTION_BYTES)
+    extra, size = [], len(inst.encode('utf-8'))
+    while filler and size < target:
+        line = rng.choice(filler)
+        extra.append(line)
+        size += len(line.encode('utf-8')) + 1
+    data['instruction'] = inst + ''.join('\n' + line for line in extra)
+    return data
+
+
+def synthetic_rules(names, scale):
+    """update_prompts --rules entries retargeting the file-specific rules at the copies."""
+    rules = []
+    for r in update_prompts.RULES:
+        if r['files'] == '*':
+            continue
+        copies = [f'{Path(f).stem}-x{n}.json' for f in r['files'] if f in names for n in range(2, scale + 1)]
+        if copies:
+            rules.append(dict(r, files=copies))
+    return rules
+
+
+def generate_tree(root, scale, seed):
+    """Write a synthetic repository under root; returns a summary of its inputs."""
+    rng = random.Random(seed)
+    (root / 'data').mkdir(parents=True)
+    (root / 'prompts').mkdir()
+    for name, data in scaled_data(scale).items():
+        with (root / 'data' / name).open('w', encoding='utf-8') as fh:
+            json.dump(data, fh, indent=2, ensure_ascii=False)
+    shutil.copy2(build_html.DATA_DIR / build_html.FACETS_SOURCE, root / 'data' / build_html.FACETS_SOURCE)
+
+    names = sorted(path.name for path in build_html.PROMPTS_DIR.glob('*.json'))
+    instruction_bytes = []
+    for name in names:
+        with (build_html.PROMPTS_DIR / name).open('r', encoding='utf-8') as fh:
+            source = json.load(fh)
+        artifact = source.get('artifact', name.replace('.json', '').replace('_', ' ').title())
+        copies = 1 if name in update_prompts.SKIP_FILES else scale
+        for n in range(1, copies + 1):
+            target = name if n == 1 else f'{Path(name).stem}-x{n}.json'
+            prompt = synthetic_prompt(source, artifact, rng)
+            instruction_bytes.append(len(prompt['instruction'].encode('utf-8')))
+            with (root / 'prompts' / target).open('w', encoding='utf-8') as fh:
+                json.dump(prompt, fh, indent=2, ensure_ascii=False)
+
+    rules_path = root / 'rules.json'
+    with rules_path.open('w', encoding='utf-8') as fh:
+        json.dump(synthetic_rules(set(names), scale), fh, ensure_ascii=False)
+    for target in HTML_TARGETS:
+        shutil.copy2(REPO_ROOT / target, root / target)
+
+    return {
+        'prompt_files': len(instruction_bytes),
+        'instruction_kb_mean': round(statistics.mean(instruction_bytes) / 1024, 1),
+        'prompts_mb': round(dir_bytes(root / 'prompts') / 1024 / 1024, 2),
+        'data_mb': round(dir_bytes(root / 'data') / 1024 / 1024, 2),
+    }
+
+
+def dir_bytes(path):
+    return sum(p.stat().st_size for p in path.iterdir())
+
+
+# ── Measured operations ──────────────────────────────────────────────────────
+# Each case is (name, setup, run): setup() prepares untimed state and returns
+# the argument passed to run().
+
+@contextlib.contextmanager
+def build_root(root):
+    """Point build_html at a synthetic tree for the duration of the block."""
+    saved = {name: getattr(build_html, name) for name in
+             ('REPO_ROOT', 'DATA_DIR', 'PROMPTS_DIR', 'PACK_MANIFEST_PATH', 'BUILD_DIR', 'MANIFEST_PATH',
+              'FRAGMENT_DIR')}
+    build_html.REPO_ROOT = root
+    build_html.DATA_DIR = root / 'data'
+    build_html.PROMPTS_DIR = root / 'prompts'
+    build_html.PACK_MANIFEST_PATH = root / 'pack-manifest.json'
+    build_html.BUILD_DIR = root / '.build'
+    build_html.MANIFEST_PATH = root / '.build' / 'inline_manifest.json'
+    build_html.FRAGMENT_DIR = root / '.build' / 'fragments'
+    build_html._pack_cache.clear()
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(build_html, name, value)
+        build_html._pack_cache.clear()
+
+
+def run_main(prompts_dir, rules_path, jobs):
+    argv = ['update_prompts.py', '--prompts-dir', str(prompts_dir), '--rules', str(rules_path), '--jobs', str(jobs)]
+    saved, sys.argv = sys.argv, argv
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            update_prompts.main()
+    finally:
+        sys.argv = saved
+
+
+def cases(root, scratch, jobs):
+    prompts = root / 'prompts'
+    rules_path = root / 'rules.json'
+    rules = list(update_prompts.RULES) + update_prompts.load_rules(rules_path)
+    files = sorted(path.name for path in prompts.glob('*.json'))
+    work = scratch / 'work'
+
+    def fresh_pack():
+        shutil.rmtree(work, ignore_errors=True)
+        shutil.copytree(prompts, work)
+        return work
+
+    def processed_pack():
+        fresh_pack()
+        run_main(work, rules_path, jobs)
+        return work
+
+    def out_dir():
+        shutil.rmtree(scratch / 'out', ignore_errors=True)
+        (scratch / 'out').mkdir()
+        return scratch / 'out'
+
+    def process_all(out):
+        for fname in files:
+            update_prompts.process_file(fname, prompts, out, verbose=False, rules=rules)
+
+    def load_all(_):
+        for path in list(prompts.glob('*.json')) + list((root / 'data').glob('*.json')):
+            with path.open('r', encoding='utf-8') as fh:
+                json.load(fh)
+
+    def cold_cache():
+        shutil.rmtree(root / '.build', ignore_errors=True)
+
+    def build(force):
+        with build_root(root), contextlib.redirect_stdout(io.StringIO()):
+            build_html.build(force=force)
+
+    return [
+        ('process_file', out_dir, process_all),
+        ('main (cold)', fresh_pack, lambda pack: run_main(pack, rules_path, jobs)),
+        ('main (warm)', processed_pack, lambda pack: run_main(pack, rules_path, jobs)),
+        ('json load', lambda: None, load_all),
+        ('build (cold)', cold_cache, lambda _: build(True)),
+        ('build (warm)', lambda: build(True), lambda _: build(False)),
+    ]
+
+
+def measure(setup, run, runs):
+    """Median and individual wall times in ms, then peak traced memory in KB."""
+    samples = []
+    for _ in range(runs):
+        arg = setup()
+        started = time.perf_counter()
+        run(arg)
+        samples.append((time.perf_counter() - started) * 1000)
+    arg = setup()
+    tracemalloc.start()
+    try:
+        run(arg)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'median_ms': round(statistics.median(samples), 1),
+            'ms': [round(s, 1) for s in samples],
+            'peak_kb': round(peak / 1024)}
+
+
+def payload_sizes(root):
+    """{target: {const name: {bytes, gzip_bytes}}} from the built entry points."""
+    sizes = {}
+    for target in HTML_TARGETS:
+        sizes[target] = {}
+        with (root / target).open('r', encoding='utf-8') as fh:
+            for line in fh:
+                name = build_html.declared_name(line)
+                if name:
+                    raw = line.strip().encode('utf-8')
+                    sizes[target][name] = {'bytes': len(raw), 'gzip_bytes': len(gzip.compress(raw, mtime=0))}
+    return sizes
+
+
+def bench_scale(scale, runs, jobs, seed):
+    with tempfile.TemporaryDirectory(prefix=f'bench-tooling-{scale}x-') as tmp:
+        root, scratch = Path(tmp) / 'repo', Path(tmp) / 'scratch'
+        scratch.mkdir()
+        inputs = generate_tree(root, scale, seed)
+        results = {name: measure(setup, run, runs) for name, setup, run in cases(root, scratch, jobs)}
+        return {'inputs': inputs, 'cases': results, 'payloads': payload_sizes(root)}
+
+
+# ── Reporting ────────────────────────────────────────────────────────────────
+
+def print_scale(scale, result):
+    inputs = result['inputs']
+    print(f'\n{scale}x: {inputs["prompt_files"]} prompts ({inputs["prompts_mb"]} MB, '
+          f'{inputs["instruction_kb_mean"]} KB mean instruction), data {inputs["data_mb"]} MB')
+    print(f'    {"case":<14} {"median ms":>10} {"peak MB":>9}')
+    for name, case in result['cases'].items():
+        print(f'    {name:<14} {case["median_ms"]:>10.1f} {case["peak_kb"] / 1024:>9.1f}')
+    for target, payloads in result['payloads'].items():
+        print(f'    {target}:')
+        for name, size in payloads.items():
+            print(f'      {name:<22} {size["bytes"] / 1024:>9.0f} KB  ({size["gzip_bytes"] / 1024:.0f} KB gzip)')
+
+
+def metrics(results):
+    """Flatten results into {label: value} for comparison."""
+    flat = {}
+    for scale, result in results['scales'].items():
+        for name, case in result['cases'].items():
+            flat[f'{scale}x {name} median ms'] = case['median_ms']
+            flat[f'{scale}x {name} peak KB'] = case['peak_kb']
+        for target, payloads in result['payloads'].items():
+            for name, size in payloads.items():
+                flat[f'{scale}x {target} {name} bytes'] = size['bytes']
+    return flat
+
+
+def compare(results, baseline, threshold):
+    """Print changes against the baseline; returns the number of regressions."""
+    current, previous = metrics(results), metrics(baseline)
+    shared = [label for label in current if label in previous]
+    if not shared:
+        print('\nBaseline has no matching scales; nothing compared.')
+        return 0
+    regressions = 0
+    print(f'\nAgainst baseline ({baseline["recorded"]}, threshold {threshold:.0%}):')
+    for label in shared:
+        before, after = previous[label], current[label]
+        change = (after - before) / before if before else 0.0
+        if change > threshold:
+            regressions += 1
+            print(f'  REGRESSION: {label}: {before} -> {after} ({change:+.0%})')
+        elif change < -threshold:
+            print(f'  IMPROVED: {label}: {before} -> {after} ({change:+.0%})')
+    print(f'  {len(shared)} metrics compared, {regressions} regression(s).')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the prompt and payload tooling on synthetic inputs.')
+    parser.add_argument('--scales', default='10,100', help='comma-separated scale factors (default: 10,100)')
+    parser.add_argument('--runs', type=int, default=3, help='timed runs per case (default: 3)')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N', help='--jobs passed to update_prompts.main')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic padding (default: 0)')
+    parser.add_argument('--out', type=Path, help=f'results file (default: {RESULTS_DIR}/tooling-<time>.json)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help=f'default: {BASELINE_PATH}')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='relative increase reported as a regression (default: 0.25)')
+    args = parser.parse_args()
+
+    try:
+        scales = [int(s) for s in args.scales.split(',') if s.strip()]
+    except ValueError:
+        scales = []
+    if not scales or min(scales) < 1 or args.runs < 1:
+        print('ERROR: --scales must be positive integers and --runs at least 1')
+        sys.exit(1)
+
+    recorded = time.strftime('%Y-%m-%dT%H:%M:%S')
+    results = {
+        'version': RESULTS_VERSION,
+        'recorded': recorded,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'runs': args.runs,
+        'jobs': args.jobs,
+        'seed': args.seed,
+        'scales': {},
+    }
+    for scale in scales:
+        started = time.perf_counter()
+        results['scales'][str(scale)] = bench_scale(scale, args.runs, args.jobs, args.seed)
+        print_scale(scale, results['scales'][str(scale)])
+        print(f'    ({time.perf_counter() - started:.1f} s)')
+
+    out = args.baseline if args.save_baseline else args.out or RESULTS_DIR / f'tooling-{recorded.replace(":", "")}.json'
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open('w', encoding='utf-8') as fh:
+        json.dump(results, fh, indent=2)
+        fh.write('\n')
+    print(f'\nResults written to {out}')
+
+    if args.save_baseline or not args.baseline.exists():
+        return
+    with args.baseline.open('r', encoding='utf-8') as fh:
+        baseline = json.load(fh)
+    if baseline.get('version') != RESULTS_VERSION:
+        print(f'\nBaseline {args.baseline} is from an older results format; nothing compared.')
+        return
+    if compare(results, baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,984 @@
+#!/usr/bin/env python3
+"""
+Regenerate the inlined payloads in index.html and index-standalone.html.
+
+Both HTML entry points carry the catalogues and prompt templates as
+single-line declarations (`const INLINED_DATA = {...};` and
+`const INLINED_PROMPTS = {...};`). This script rebuilds those lines from
+data/*.json and prompts/*.json:
+  1. Every source is content-hashed and compared with the build manifest;
+     a target whose sources and HTML are unchanged is skipped.
+  2. Each source is serialised once and cached by hash, so only edited
+     sources are re-parsed.
+  3. A stale HTML file is rewritten in one streaming pass that replaces only
+     the payload lines, then swapped into place atomically.
+
+index.html is the served entry point: its INLINED_PROMPTS carries prompt
+metadata only, and the page fetches each body from prompts/ when its card
+first opens. index-standalone.html keeps every prompt body inline so it
+works from file://, as a prompt pack (INLINED_PROMPT_PACK): lines shared
+between prompts are stored once in a fragment dictionary and each prompt
+is a list of fragment indexes and unique text. With --compress the pack is
+embedded deflate-compressed and base64-encoded, and the page inflates it
+with DecompressionStream.
+
+INLINED_DATA carries the catalogues in a flat, interned form: each level of a
+hierarchy is a set of columns (one entry per node) plus the number of
+children of each node. Nodes are stored grouped by parent, so those counts
+give every node's child range. Labels are interned into one string table as
+the columns are read: a label's first occurrence is its text, and later
+occurrences are its index in the table. The page decodes this back into the
+nested objects in one pass at load; the workflow is inlined as-is.
+
+Both targets also carry INLINED_SEARCH_INDEX, an inverted index over the
+selectable catalogues that backs the form's type-ahead search, and
+INLINED_FACETS, the pre-resolved view for every industry and sector: which
+regulatory and risk industry groups apply ("All Industries" merged in) and
+which industry-specific technologies and partner offerings to suggest. The
+rules live in data/industry_facets.json; a rule naming something the
+catalogues no longer contain fails the build.
+
+Each prompt's INLINED_PROMPTS entry also lists the placeholders of the
+ENGAGEMENT CONTEXT block at the start of its instruction as [start, end, slot]
+offsets (see PROMPT_SLOTS), so the page fills them from the form by slicing
+the instruction at known offsets, without scanning it.
+
+The build also writes pack-manifest.json, which lists index.html and every
+prompt body with its content hash; sw.js uses it to cache the app for
+offline use and to fetch only what changed in a new release.
+
+Usage:
+  python scripts/build_html.py            # incremental build
+  python scripts/build_html.py --force    # ignore the manifest
+  python scripts/build_html.py --check    # exit 1 if any target is stale (no manifest needed)
+  python scripts/build_html.py --compress # embed the prompt pack compressed
+  python scripts/build_html.py --report   # print the payload size reports
+  python scripts/build_html.py --verify   # decode INLINED_DATA and compare with data/
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import tempfile
+import time
+import zlib
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / 'data'
+PROMPTS_DIR = REPO_ROOT / 'prompts'
+PACK_MANIFEST_PATH = REPO_ROOT / 'pack-manifest.json'
+BUILD_DIR = REPO_ROOT / '.build'
+MANIFEST_PATH = BUILD_DIR / 'inline_manifest.json'
+FRAGMENT_DIR = BUILD_DIR / 'fragments'
+
+# Bump when the payload format changes so every target is rebuilt once.
+BUILD_VERSION = 7
+
+# INLINED_DATA key -> data/ file, in the order the page expects them.
+DATA_SOURCES = {
+    'industries': 'industries.json',
+    'workflow': 'workflow.json',
+    'objectives': 'objectives.json',
+    'services': 'service_offerings.json',
+    'technologies': 'technologies.json',
+    'partners': 'alliance_partners.json',
+    'regulatory': 'regulatory_profile.json',
+    'risk': 'risk_profile.json',
+}
+
+# Catalogues inlined in the flat encoding, as INLINED_DATA key -> (keys down to
+# the top-level list, children field for each level). The last level has no
+# children and may be a list of plain strings.
+CATALOGUE_SHAPES = {
+    'industries': (('industries',), ('sectors', 'sub_sectors', None)),
+    'objectives': (('engagement_objectives', 'objective_types'), ('themes', 'specific_objectives', None)),
+    'services': (('domains',), ('building_blocks', None)),
+    'technologies': (('technology_and_tools', 'categories'), ('sub_categories', 'options', None)),
+    'partners': (('alliance_partners', 'partners'), ('product_families', 'products', None)),
+    'regulatory': (('regulatory_profile', 'industry_groups'), ('regulators', 'requirements', None)),
+    'risk': (('risk_profile', 'industry_groups'), ('risk_types', 'specific_risks', None)),
+}
+
+# Offline pack manifest (read by sw.js): the page's resources and content hashes.
+PACK_MANIFEST_FORMAT = 'delivery-launcher-pack/1'
+
+# Prompt fields kept in the metadata-only payload; the body is fetched on demand.
+PROMPT_META_FIELDS = ('prompt_id', 'prompt_name', 'artifact')
+
+# Prompt slots: the placeholder after each of these labels in an instruction's
+# leading ENGAGEMENT CONTEXT block (update_prompts.CONTEXT_BLOCK) is compiled
+# to [start, end, slot ID]. The page fills slots from the brief (PROMPT_SLOTS in
+# index.html, SLOT_VALUES in render_prompts.py).
+CONTEXT_HEADING = 'ENGAGEMENT CONTEXT —'
+PROMPT_SLOTS = {
+    'Client Name': 'client_name',
+    'Engagement Name': 'engagement_name',
+    'Engagement Code': 'engagement_code',
+    'Engagement Manager': 'engagement_manager',
+    'Partner in Charge': 'partner_in_charge',
+    'Industry Sector': 'industry',
+    'Service Line / Capability': 'service_line',
+    'Delivery Methodology': 'delivery_methodology',
+    'Fee Structure': 'fee_structure',
+    'Engagement Start Date': 'start_date',
+    'Engagement End Date': 'end_date',
+    'Total Budget / Fee': 'total_budget',
+    'Primary Workstreams': 'primary_workstreams',
+    'Key Client Stakeholders': 'key_stakeholders',
+    'Engagement Complexity': 'engagement_complexity',
+    'Regulatory / Compliance Requirements': 'regulatory_requirements',
+}
+
+# Prompt pack: instructions are split into lines, and any line of at least
+# MIN_FRAGMENT_CHARS that occurs more than once becomes a shared fragment.
+PACK_SEPARATOR = '\n'
+MIN_FRAGMENT_CHARS = 8
+
+# Catalogues covered by the search index, as INLINED_DATA key -> (keys down to
+# the top-level list, (name field, children field) for each level). A level
+# whose name field is None is a list of plain strings.
+SEARCH_CATALOGUES = {
+    'services': (('domains',), (('domain', 'building_blocks'), ('building_block', None))),
+    'technologies': (('technology_and_tools', 'categories'),
+                     (('category', 'sub_categories'), ('sub_category', 'options'), (None, None))),
+    'partners': (('alliance_partners', 'partners'),
+                 (('partner', 'product_families'), ('product_family', 'products'), (None, None))),
+    'regulatory': (('regulatory_profile', 'industry_groups'),
+                   (('industry_group', 'regulators'), ('regulator', 'requirements'), (None, None))),
+    'risk': (('risk_profile', 'industry_groups'),
+             (('industry_group', 'risk_types'), ('risk_type', 'specific_risks'), (None, None))),
+}
+SEARCH_TOKEN = re.compile(r'[a-z0-9]+')
+
+# Industry facets (data/industry_facets.json): for each industry in
+# industries.json, the regulatory and risk industry groups it falls under, plus
+# the industry-specific technologies and partner offerings worth suggesting. A
+# sector's view is its industry's rules plus the sector's own; the file's
+# all_industries_group is in every view.
+FACETS_SOURCE = 'industry_facets.json'
+FACET_GROUP_CATALOGUES = ('regulatory', 'risk')
+FACET_SUGGEST_CATALOGUES = ('technologies', 'partners')
+
+
+# ── Sources and fragments ────────────────────────────────────────────────────
+
+def prompt_files():
+    return sorted(PROMPTS_DIR.glob('*.json'))
+
+
+def source_paths():
+    """Every file that feeds a payload, as repo-relative POSIX paths."""
+    paths = [f'data/{name}' for name in DATA_SOURCES.values()] + [f'data/{FACETS_SOURCE}']
+    paths += [f'prompts/{path.name}' for path in prompt_files()]
+    return paths
+
+
+def hash_sources(paths, previous):
+    """Return {relpath: {size, mtime_ns, sha256}}, re-hashing only on stat change."""
+    result = {}
+    for rel in paths:
+        st = (REPO_ROOT / rel).stat()
+        prev = previous.get(rel)
+        if prev and prev['size'] == st.st_size and prev['mtime_ns'] == st.st_mtime_ns:
+            result[rel] = prev
+            continue
+        digest = hashlib.sha256((REPO_ROOT / rel).read_bytes()).hexdigest()
+        result[rel] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
+    return result
+
+
+def load_fragment(rel, digest):
+    """Compact JSON for one source, served from the fragment cache when possible."""
+    cached = FRAGMENT_DIR / f'{digest}.json'
+    try:
+        return cached.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        pass
+    with (REPO_ROOT / rel).open('r', encoding='utf-8') as fh:
+        fragment = json.dumps(json.load(fh), ensure_ascii=False)
+    FRAGMENT_DIR.mkdir(parents=True, exist_ok=True)
+    # Written aside and renamed, so a concurrent build never reads half a fragment.
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{digest}.', dir=FRAGMENT_DIR)
+    with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+        fh.write(fragment)
+    os.replace(tmp_name, cached)
+    return fragment
+
+
+def prune_fragments(hashes):
+    """Delete cached fragments for source contents not in hashes; returns the count removed.
+
+    Every edit to a source caches a new fragment, so without pruning a
+    long-running watcher would grow .build/fragments without bound.
+    """
+    keep = {f'{entry["sha256"]}.json' for entry in hashes.values()}
+    removed = 0
+    for path in FRAGMENT_DIR.glob('*.json'):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+# ── Prompt slots ─────────────────────────────────────────────────────────────
+
+def prompt_slots(instruction):
+    """[[start, end, slot ID]] for each placeholder in the ENGAGEMENT CONTEXT block.
+
+    Only the block at the very start of the instruction is read, up to its
+    closing `---` rule, so placeholders quoted later in the prompt (the
+    thin-context check names [CLIENT_NAME]) are never filled.
+    """
+    if not instruction.startswith(CONTEXT_HEADING):
+        return []
+    end = instruction.find('\n---\n')
+    slots = []
+    offset = 0
+    for line in instruction[:end if end >= 0 else len(instruction)].split('\n'):
+        label, sep, value = line.partition(': ')
+        if sep and label in PROMPT_SLOTS and value.startswith('[') and value.endswith(']'):
+            start = offset + len(label) + len(sep)
+            slots.append([start, start + len(value), PROMPT_SLOTS[label]])
+        offset += len(line) + 1
+    return slots
+
+
+def utf16_index(text, index):
+    """A code-point index into text as an index into the page's UTF-16 string."""
+    return index + sum(1 for ch in text[:index] if ord(ch) > 0xFFFF)
+
+
+# ── Prompt pack ──────────────────────────────────────────────────────────────
+
+_pack_cache = {}
+
+
+def prompt_pack(hashes):
+    """Return {'fragments': [...], 'prompts': {file: [parts]}} for every prompt.
+
+    A part is either a fragment index or a run of unique lines; joining the
+    resolved parts with PACK_SEPARATOR reproduces the instruction exactly.
+    """
+    key = tuple(hashes[f'prompts/{path.name}']['sha256'] for path in prompt_files())
+    if key in _pack_cache:
+        return _pack_cache[key]
+
+    instructions = {}
+    for path in prompt_files():
+        rel = f'prompts/{path.name}'
+        prompt = json.loads(load_fragment(rel, hashes[rel]['sha256']))
+        instructions[path.name] = prompt.get('instruction', '').split(PACK_SEPARATOR)
+
+    counts = {}
+    for lines in instructions.values():
+        for line in lines:
+            counts[line] = counts.get(line, 0) + 1
+
+    fragments, index, prompts = [], {}, {}
+    for name, lines in instructions.items():
+        parts = []
+        for line in lines:
+            if counts[line] > 1 and len(line) >= MIN_FRAGMENT_CHARS:
+                if line not in index:
+                    index[line] = len(fragments)
+                    fragments.append(line)
+                parts.append(index[line])
+            elif parts and isinstance(parts[-1], str):
+                parts[-1] += PACK_SEPARATOR + line
+            else:
+                parts.append(line)
+        prompts[name] = parts
+
+    pack = {'fragments': fragments, 'prompts': prompts}
+    for name, lines in instructions.items():
+        if unpack_instruction(pack, name) != PACK_SEPARATOR.join(lines):
+            raise ValueError(f'prompt pack does not round-trip for {name}')
+    _pack_cache.clear()
+    _pack_cache[key] = pack
+    return pack
+
+
+def unpack_instruction(pack, name):
+    """Reassemble one instruction, as the page does at render time."""
+    return PACK_SEPARATOR.join(
+        pack['fragments'][part] if isinstance(part, int) else part
+        for part in pack['prompts'][name]
+    )
+
+
+def encode_pack(pack, compress):
+    """The pack as a JS literal: a JSON object, or a base64 string of its deflate stream."""
+    encoded = json.dumps(pack, ensure_ascii=False)
+    if not compress:
+        return encoded
+    return json.dumps(base64.b64encode(zlib.compress(encoded.encode('utf-8'), 9)).decode('ascii'))
+
+
+def pack_report(hashes):
+    """Print per-prompt and total sizes for the plain, packed and compressed payloads."""
+    pack = prompt_pack(hashes)
+    fragment_bytes = [len(json.dumps(fragment, ensure_ascii=False).encode('utf-8')) for fragment in pack['fragments']]
+    print(f'  {"prompt":<34} {"plain":>9} {"packed":>9} {"saved":>6}')
+    for path in prompt_files():
+        rel = f'prompts/{path.name}'
+        prompt = json.loads(load_fragment(rel, hashes[rel]['sha256']))
+        plain = len(json.dumps(prompt.get('instruction', ''), ensure_ascii=False).encode('utf-8'))
+        packed = len(json.dumps(pack['prompts'][path.name], ensure_ascii=False).encode('utf-8'))
+        print(f'  {path.name:<34} {plain:>9,} {packed:>9,} {1 - packed / plain:>6.0%}')
+
+    plain_total = sum(
+        len(load_fragment(f'prompts/{path.name}', hashes[f'prompts/{path.name}']['sha256']).encode('utf-8'))
+        for path in prompt_files()
+    )
+    packed_total = len(encode_pack(pack, False).encode('utf-8'))
+    compressed_total = len(encode_pack(pack, True))
+    print(f'\n  Shared fragments: {len(pack["fragments"])} ({sum(fragment_bytes):,} bytes)')
+    print(f'  Prompt payload: {plain_total:,} bytes plain, {packed_total:,} packed '
+          f'({1 - packed_total / plain_total:.0%} smaller), {compressed_total:,} compressed '
+          f'({1 - compressed_total / plain_total:.0%} smaller)\n')
+
+
+# ── Catalogue encoding ───────────────────────────────────────────────────────
+
+_data_cache = {}
+
+
+def encode_catalogue(key, value, intern):
+    """Flatten one catalogue, passing every label through intern().
+
+    Returns {'root', 'path', 'levels'}: root is the source object with the
+    top-level list (at path) set to null. Each level holds 'columns' (one list per field, one entry
+    per node) and, for objects, 'keys' (field order) and 'children' plus
+    'counts' (children per node) when the level has a next one.
+    """
+    path, children = CATALOGUE_SHAPES[key]
+    root = json.loads(json.dumps(value))
+    holder = root
+    for step in path[:-1]:
+        holder = holder[step]
+    items = holder[path[-1]]
+    holder[path[-1]] = None
+
+    def label(text, where):
+        if not isinstance(text, str):
+            raise ValueError(f'{key}: expected a string at {where}, got {json.dumps(text)}')
+        return intern(text)
+
+    levels = []
+    for depth, child_field in enumerate(children):
+        where = '.'.join(path) + '[]' * (depth + 1)
+        if items and all(isinstance(item, str) for item in items):
+            levels.append({'columns': [[label(item, where) for item in items]]})
+            items = []
+            continue
+        keys = list(items[0]) if items else []
+        for item in items:
+            if not isinstance(item, dict) or list(item) != keys:
+                raise ValueError(f'{key}: every item at {where} must be an object with keys {keys}')
+        fields = [field for field in keys if field != child_field]
+        level = {'keys': keys,
+                 'columns': [[label(item[field], f'{where}.{field}') for item in items] for field in fields]}
+        if child_field in keys:
+            level['children'] = child_field
+            level['counts'] = [len(item[child_field]) for item in items]
+            items = [child for item in items for child in item[child_field]]
+        else:
+            items = []
+        levels.append(level)
+    return {'root': root, 'path': list(path), 'levels': levels}
+
+
+def encode_data(data):
+    """The INLINED_DATA object for {key: source JSON}, catalogues flattened.
+
+    Columns are emitted in the order the page reads them (catalogue by
+    catalogue, level by level, column by column), so a label's first
+    occurrence is its text and every later one is its index in the table.
+    """
+    ids = {}
+
+    def intern(text):
+        if text in ids:
+            return ids[text]
+        ids[text] = len(ids)
+        return text
+
+    catalogues = {key: encode_catalogue(key, data[key], intern) for key in CATALOGUE_SHAPES if key in data}
+    encoded = {'catalogues': catalogues}
+    encoded.update((key, value) for key, value in data.items() if key not in catalogues)
+    return encoded
+
+
+def decode_catalogue(catalogue, strings):
+    """Rebuild one catalogue, as decodeCatalogue() does in the page; strings is
+    the string table so far and grows with the labels read here."""
+    def label(cell):
+        if isinstance(cell, int):
+            return strings[cell]
+        strings.append(cell)
+        return cell
+
+    parent = None
+    top = []
+    for level in catalogue['levels']:
+        columns = [[label(cell) for cell in column] for column in level['columns']]
+        size = len(columns[0]) if columns else 0
+        if 'keys' not in level:
+            nodes = columns[0] if columns else []
+        else:
+            nodes = []
+            for i in range(size):
+                node, column = {}, 0
+                for field in level['keys']:
+                    if field == level.get('children'):
+                        node[field] = []
+                    else:
+                        node[field] = columns[column][i]
+                        column += 1
+                nodes.append(node)
+        if parent is None:
+            top = nodes
+        else:
+            start = 0
+            for node, count in zip(parent['nodes'], parent['counts']):
+                node[parent['children']] = nodes[start:start + count]
+                start += count
+        parent = {'nodes': nodes, 'counts': level.get('counts', []), 'children': level.get('children')}
+
+    root = json.loads(json.dumps(catalogue['root']))
+    holder = root
+    for step in catalogue['path'][:-1]:
+        holder = holder[step]
+    holder[catalogue['path'][-1]] = top
+    return root
+
+
+def decode_data(encoded):
+    data = {key: value for key, value in encoded.items() if key != 'catalogues'}
+    strings = []
+    for key, catalogue in encoded['catalogues'].items():
+        data[key] = decode_catalogue(catalogue, strings)
+    return data
+
+
+def source_data(hashes):
+    return {key: json.loads(load_fragment(f'data/{name}', hashes[f'data/{name}']['sha256']))
+            for key, name in DATA_SOURCES.items()}
+
+
+def encoded_data(hashes):
+    """The INLINED_DATA literal, checked to decode back to data/ exactly."""
+    key = tuple(hashes[f'data/{name}']['sha256'] for name in DATA_SOURCES.values())
+    if key in _data_cache:
+        return _data_cache[key]
+    data = source_data(hashes)
+    literal = json.dumps(encode_data(data), ensure_ascii=False, separators=(',', ':'))
+    decoded = decode_data(json.loads(literal))
+    for name in DATA_SOURCES:
+        if json.dumps(decoded[name], ensure_ascii=False) != json.dumps(data[name], ensure_ascii=False):
+            raise ValueError(f'catalogue encoding does not round-trip for {name}')
+    _data_cache.clear()
+    _data_cache[key] = literal
+    return literal
+
+
+def data_report(hashes):
+    """Print per-catalogue sizes for the plain and flat encodings. A label
+    shared with an earlier catalogue is counted there."""
+    data = source_data(hashes)
+    encoded = encode_data(data)
+    size = lambda value: len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    print(f'  {"catalogue":<34} {"plain":>9} {"flat":>9}')
+    for key in encoded['catalogues']:
+        print(f'  {key:<34} {size(data[key]):>9,} {size(encoded["catalogues"][key]):>9,}')
+    plain_total = len(('{' + ', '.join(
+        json.dumps(key) + ': ' + load_fragment(f'data/{name}', hashes[f'data/{name}']['sha256'])
+        for key, name in DATA_SOURCES.items()) + '}').encode('utf-8'))
+    flat_total = len(encoded_data(hashes).encode('utf-8'))
+    labels = sum(isinstance(cell, str) for catalogue in encoded['catalogues'].values()
+                 for level in catalogue['levels'] for column in level['columns'] for cell in column)
+    repeats = sum(isinstance(cell, int) for catalogue in encoded['catalogues'].values()
+                  for level in catalogue['levels'] for column in level['columns'] for cell in column)
+    print(f'\n  String table: {labels:,} labels, {repeats:,} repeats stored as references')
+    print(f'  Data payload: {plain_total:,} bytes plain, {flat_total:,} flat '
+          f'({1 - flat_total / plain_total:.0%} smaller)\n')
+
+
+def verify_data(hashes):
+    """Decode INLINED_DATA from every target and compare it with data/.
+
+    Returns the number of mismatched sources.
+    """
+    data = source_data(hashes)
+    failures = 0
+    for target in TARGETS:
+        literal = None
+        with (REPO_ROOT / target).open('r', encoding='utf-8') as fh:
+            for line in fh:
+                if declared_name(line) == 'INLINED_DATA':
+                    literal = line.split('=', 1)[1].strip().rstrip(';')
+                    break
+        if literal is None:
+            print(f'  FAILED: {target}: no INLINED_DATA declaration')
+            failures += 1
+            continue
+        decoded = decode_data(json.loads(literal))
+        bad = [key for key in DATA_SOURCES
+               if json.dumps(decoded.get(key), ensure_ascii=False) != json.dumps(data[key], ensure_ascii=False)]
+        for key in bad:
+            print(f'  MISMATCH: {target}: {key} does not match data/{DATA_SOURCES[key]}')
+        if not bad:
+            print(f'  ROUND TRIP OK: {target} ({len(DATA_SOURCES)} sources)')
+        failures += len(bad)
+    return failures
+
+
+# ── Search index ─────────────────────────────────────────────────────────────
+
+def search_tokens(text):
+    """Lower-case alphanumeric tokens, matching the page's query tokeniser."""
+    return SEARCH_TOKEN.findall(text.lower())
+
+
+def search_index(hashes):
+    """Build {'catalogues', 'entries', 'tokens', 'postings'} over SEARCH_CATALOGUES.
+
+    Each entry is [catalogue number, index, index, ...]: the path of list
+    positions from the catalogue's top-level list down to one item, so the page
+    resolves names from INLINED_DATA instead of storing them twice. Tokens are
+    sorted for binary-search prefix lookup; postings[i] lists the entries whose
+    own name contains tokens[i].
+    """
+    entries, postings = [], {}
+
+    def walk(items, levels, path, catalogue):
+        name_field, children_field = levels[0]
+        for i, item in enumerate(items):
+            entry_path = path + [i]
+            entry_id = len(entries)
+            entries.append([catalogue] + entry_path)
+            name = item[name_field] if name_field else item
+            for token in set(search_tokens(name)):
+                postings.setdefault(token, []).append(entry_id)
+            if children_field:
+                walk(item.get(children_field, []), levels[1:], entry_path, catalogue)
+
+    for catalogue, (key, (root, levels)) in enumerate(SEARCH_CATALOGUES.items()):
+        rel = f'data/{DATA_SOURCES[key]}'
+        items = json.loads(load_fragment(rel, hashes[rel]['sha256']))
+        for step in root:
+            items = items[step]
+        walk(items, levels, [], catalogue)
+
+    tokens = sorted(postings)
+    return {
+        'catalogues': list(SEARCH_CATALOGUES),
+        'entries': entries,
+        'tokens': tokens,
+        'postings': [postings[token] for token in tokens],
+    }
+
+
+# ── Industry facets ──────────────────────────────────────────────────────────
+
+def catalogue_path(items, levels, names, key):
+    """List positions of the item named by names, walking SEARCH_CATALOGUES levels."""
+    path = []
+    for (name_field, children_field), name in zip(levels, names):
+        labels = [item[name_field] if name_field else item for item in items]
+        if name not in labels:
+            raise ValueError(f'industry facet: {key} has no {" > ".join(names)}')
+        path.append(labels.index(name))
+        items = items[path[-1]].get(children_field, []) if children_field else []
+    return path
+
+
+def facet_index(hashes):
+    """Build {'industries': [{'view', 'sectors'}]} from data/industry_facets.json.
+
+    industries[i] follows the order of appData.industries and sectors[j] the
+    order of its sectors. Each view holds, per catalogue, the positions of the
+    regulatory and risk industry groups that apply (all_industries_group merged in)
+    and the [category, sub-category] / [partner, family, product] paths to
+    suggest, so the page resolves an industry or sector with one lookup.
+    """
+    data = source_data(hashes)
+    rel = f'data/{FACETS_SOURCE}'
+    config = json.loads(load_fragment(rel, hashes[rel]['sha256']))['industry_facets']
+    roots = {}
+    for key, (root, levels) in SEARCH_CATALOGUES.items():
+        items = data[key]
+        for step in root:
+            items = items[step]
+        roots[key] = (items, levels)
+
+    def paths(rules):
+        """A rule's entries as catalogue name paths."""
+        return {
+            'technologies': [(entry['category'], entry['sub_category']) for entry in rules.get('technologies', ())],
+            'partners': [tuple(entry[field] for field in ('partner', 'product_family', 'product') if field in entry)
+                         for entry in rules.get('partners', ())],
+        }
+
+    def resolve(rules, view):
+        for group in rules.get('groups', ()):
+            found = False
+            for key in FACET_GROUP_CATALOGUES:
+                items, levels = roots[key]
+                if any(item[levels[0][0]] == group for item in items):
+                    view[key].update(catalogue_path(items, levels, (group,), key))
+                    found = True
+            if not found:
+                raise ValueError(f'industry facet: no industry group named {group}')
+        suggested = paths(rules)
+        for key in FACET_SUGGEST_CATALOGUES:
+            items, levels = roots[key]
+            for names in suggested[key]:
+                view[key].add(tuple(catalogue_path(items, levels, names, key)))
+
+    def finish(view):
+        return {key: sorted(list(value) if key in FACET_SUGGEST_CATALOGUES else value
+                            for value in values)
+                for key, values in view.items()}
+
+    industries = data['industries']['industries']
+    known = {ind['industry']: {sec['sector'] for sec in ind['sectors']} for ind in industries}
+    facet_rules = {}
+    for rules in config['industries']:
+        industry = rules['industry']
+        if industry not in known:
+            raise ValueError(f'industry facet: industries.json has no industry {industry}')
+        sector_rules = {sector['sector']: sector for sector in rules.get('sectors', ())}
+        for sector in sector_rules:
+            if sector not in known[industry]:
+                raise ValueError(f'industry facet: {industry} has no sector {sector}')
+        facet_rules[industry] = (rules, sector_rules)
+
+    base = {key: set() for key in FACET_GROUP_CATALOGUES + FACET_SUGGEST_CATALOGUES}
+    resolve({'groups': (config['all_industries_group'],)}, base)
+    facets = []
+    for ind in industries:
+        rules, sector_rules = facet_rules.get(ind['industry'], ({}, {}))
+        view = {key: set(values) for key, values in base.items()}
+        resolve(rules, view)
+        sectors = []
+        for sec in ind['sectors']:
+            sector_view = {key: set(values) for key, values in view.items()}
+            resolve(sector_rules.get(sec['sector'], {}), sector_view)
+            sectors.append(finish(sector_view))
+        facets.append({'view': finish(view), 'sectors': sectors})
+    return {'industries': facets}
+
+
+# ── Payload blocks ───────────────────────────────────────────────────────────
+# Each block yields the pieces of its literal so the rewrite can stream them
+# to disk without joining the full payload in memory.
+
+def data_block(hashes, options):
+    yield encoded_data(hashes)
+
+
+def prompts_meta_block(hashes, options):
+    """Metadata-only prompts: no instruction, plus depends_on from the workflow,
+    a content revision the page appends to the fetch URL for cache busting, and
+    the instruction's compiled ENGAGEMENT CONTEXT slots."""
+    workflow = json.loads(load_fragment('data/workflow.json', hashes['data/workflow.json']['sha256']))
+    depends_on = {
+        step['file']: step.get('depends_on')
+        for phase in workflow['phases'] for step in phase['prompts']
+    }
+    yield '{'
+    for i, path in enumerate(prompt_files()):
+        rel = f'prompts/{path.name}'
+        digest = hashes[rel]['sha256']
+        prompt = json.loads(load_fragment(rel, digest))
+        meta = {field: prompt[field] for field in PROMPT_META_FIELDS if field in prompt}
+        meta['depends_on'] = depends_on.get(path.name)
+        meta['rev'] = digest[:12]
+        instruction = prompt.get('instruction') or ''
+        slots = prompt_slots(instruction)
+        if slots:
+            meta['slots'] = [[utf16_index(instruction, start), utf16_index(instruction, end), slot]
+                             for start, end, slot in slots]
+        yield (', ' if i else '') + json.dumps(path.name) + ': '
+        yield json.dumps(meta, ensure_ascii=False)
+    yield '}'
+
+
+def prompt_pack_block(hashes, options):
+    yield encode_pack(prompt_pack(hashes), options['compress'])
+
+
+def no_pack_block(hashes, options):
+    yield 'null'
+
+
+def search_index_block(hashes, options):
+    yield json.dumps(search_index(hashes), separators=(',', ':'))
+
+
+def facets_block(hashes, options):
+    yield json.dumps(facet_index(hashes), separators=(',', ':'))
+
+
+# Target file -> {const name: block builder}
+TARGETS = {
+    'index.html': {
+        'INLINED_DATA': data_block,
+        'INLINED_PROMPTS': prompts_meta_block,
+        'INLINED_PROMPT_PACK': no_pack_block,
+        'INLINED_SEARCH_INDEX': search_index_block,
+        'INLINED_FACETS': facets_block,
+    },
+    'index-standalone.html': {
+        'INLINED_DATA': data_block,
+        'INLINED_PROMPTS': prompts_meta_block,
+        'INLINED_PROMPT_PACK': prompt_pack_block,
+        'INLINED_SEARCH_INDEX': search_index_block,
+        'INLINED_FACETS': facets_block,
+    },
+}
+
+
+# ── Manifest ─────────────────────────────────────────────────────────────────
+
+def read_manifest():
+    try:
+        with MANIFEST_PATH.open('r', encoding='utf-8') as fh:
+            manifest = json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return {'version': BUILD_VERSION, 'sources': {}, 'targets': {}}
+    if manifest.get('version') != BUILD_VERSION:
+        return {'version': BUILD_VERSION, 'sources': {}, 'targets': {}}
+    return manifest
+
+
+def write_manifest(manifest):
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_PATH.with_suffix('.tmp')
+    with tmp.open('w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def html_stamp(path):
+    st = path.stat()
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def sources_key(hashes):
+    """One digest over every source hash, used to detect stale targets."""
+    h = hashlib.sha256()
+    for rel in sorted(hashes):
+        h.update(f'{rel}\0{hashes[rel]["sha256"]}\n'.encode('utf-8'))
+    return h.hexdigest()
+
+
+# ── Streaming rewrite ────────────────────────────────────────────────────────
+
+def declared_name(line):
+    """Return the const name if the line declares one of our payloads."""
+    stripped = line.lstrip()
+    if not stripped.startswith('const INLINED_'):
+        return None
+    return stripped[len('const '):].split('=', 1)[0].strip()
+
+
+def write_payloads(path, out, blocks, hashes, options):
+    """Copy path to the text stream out, regenerating every payload line."""
+    remaining = set(blocks)
+    with path.open('r', encoding='utf-8', newline='') as src:
+        for line in src:
+            name = declared_name(line)
+            if name not in remaining:
+                out.write(line)
+                continue
+            indent = line[:len(line) - len(line.lstrip())]
+            newline = '\r\n' if line.endswith('\r\n') else '\n' if line.endswith('\n') else ''
+            out.write(f'{indent}const {name} = ')
+            for piece in blocks[name](hashes, options):
+                out.write(piece)
+            out.write(';' + newline)
+            remaining.discard(name)
+    if remaining:
+        raise ValueError(f'{path.name}: missing payload declaration(s): {", ".join(sorted(remaining))}')
+
+
+def rewrite_html(path, blocks, hashes, options):
+    """Replace every payload line in path in a single pass, then swap it into place."""
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{path.name}.', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as out:
+            write_payloads(path, out, blocks, hashes, options)
+        os.chmod(tmp_name, path.stat().st_mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def render_html(path, blocks, hashes, options):
+    """path's text with every payload line regenerated, built in memory.
+
+    serve.py renders the page this way, so serving never writes the tracked
+    HTML files or the build manifest.
+    """
+    out = io.StringIO(newline='')
+    write_payloads(path, out, blocks, hashes, options)
+    return out.getvalue()
+
+
+def html_current(path, blocks, hashes, options):
+    """True when every payload line in path is what rewrite_html would write.
+
+    Used by --check when the build manifest has no record of the file (a
+    fresh clone, or .build/ removed): the payload lines are regenerated in
+    memory and compared, so only a real difference is reported as stale.
+    """
+    remaining = set(blocks)
+    with path.open('r', encoding='utf-8', newline='') as src:
+        for line in src:
+            name = declared_name(line)
+            if name not in remaining:
+                continue
+            indent = line[:len(line) - len(line.lstrip())]
+            newline = '\r\n' if line.endswith('\r\n') else '\n' if line.endswith('\n') else ''
+            expected = f'{indent}const {name} = ' + ''.join(blocks[name](hashes, options)) + ';' + newline
+            if line != expected:
+                return False
+            remaining.discard(name)
+    return not remaining
+
+
+# ── Offline pack manifest ────────────────────────────────────────────────────
+
+def pack_manifest(resources):
+    """The pack manifest for {repo-relative path: content hash}.
+
+    sw.js caches each resource as `<path>?v=<hash>` and, when the manifest's
+    version changes, fetches only the resources whose hash changed. The
+    version is a hash over every entry.
+    """
+    entries = dict(sorted(resources.items()))
+    version = hashlib.sha256(json.dumps(entries).encode('utf-8')).hexdigest()[:12]
+    return {'format': PACK_MANIFEST_FORMAT, 'version': version, 'resources': entries}
+
+
+def prompt_resources(hashes):
+    """Prompt bodies as the page fetches them: hashed like INLINED_PROMPTS' `rev`."""
+    return {f'prompts/{path.name}': hashes[f'prompts/{path.name}']['sha256'][:12] for path in prompt_files()}
+
+
+def static_pack_manifest(hashes):
+    """The manifest for serving the repository as-is: index.html plus the prompt bodies."""
+    page = hashlib.sha256((REPO_ROOT / 'index.html').read_bytes()).hexdigest()[:12]
+    return pack_manifest(dict(prompt_resources(hashes), **{'index.html': page}))
+
+
+def write_pack_manifest(manifest, hashes, key, force, check):
+    """Bring pack-manifest.json up to date; returns True if it was (or would be) rewritten.
+
+    index.html can change without a payload rebuild, so the page is re-hashed
+    whenever its stat (or the manifest file's) differs from the one recorded
+    in the build manifest.
+    """
+    def recorded():
+        stamp = html_stamp(PACK_MANIFEST_PATH) if PACK_MANIFEST_PATH.exists() else None
+        return {'sources': key, 'html': html_stamp(REPO_ROOT / 'index.html'), 'manifest': stamp}
+
+    if not force and manifest.get('pack') == recorded():
+        print(f'  UP TO DATE: {PACK_MANIFEST_PATH.name}')
+        return False
+    text = json.dumps(static_pack_manifest(hashes), indent=2) + '\n'
+    if PACK_MANIFEST_PATH.exists() and PACK_MANIFEST_PATH.read_text(encoding='utf-8') == text:
+        print(f'  UP TO DATE: {PACK_MANIFEST_PATH.name}')
+        rewritten = False
+    elif check:
+        print(f'  STALE: {PACK_MANIFEST_PATH.name}')
+        return True
+    else:
+        PACK_MANIFEST_PATH.write_text(text, encoding='utf-8')
+        print(f'  REBUILT: {PACK_MANIFEST_PATH.name}')
+        rewritten = True
+    if not check:
+        manifest['pack'] = recorded()
+    return rewritten
+
+
+# ── Main ─────────────────────────────────────────────────────────────────────
+
+def build(force=False, check=False, compress=False, report=False, verify=False):
+    """Rebuild stale targets; return the list of target names that were (or would be) rebuilt."""
+    manifest = read_manifest()
+    hashes = hash_sources(source_paths(), manifest['sources'])
+    key = sources_key(hashes)
+    options = {'compress': compress}
+    stale = []
+
+    if report:
+        pack_report(hashes)
+        data_report(hashes)
+
+    for target, blocks in TARGETS.items():
+        path = REPO_ROOT / target
+        if not path.exists():
+            print(f'ERROR: target not found: {path}')
+            sys.exit(1)
+        recorded = manifest['targets'].get(target)
+        if not force and recorded == {'sources': key, 'html': html_stamp(path), 'options': options}:
+            print(f'  UP TO DATE: {target}')
+            continue
+        if check and html_current(path, blocks, hashes, options):
+            print(f'  UP TO DATE: {target}')
+            continue
+        stale.append(target)
+        if check:
+            print(f'  STALE: {target}')
+            continue
+        rewrite_html(path, blocks, hashes, options)
+        stamp = html_stamp(path)
+        manifest['targets'][target] = {'sources': key, 'html': stamp, 'options': options}
+        print(f'  REBUILT: {target} ({stamp["size"] / 1024:.0f} KB)')
+
+    if write_pack_manifest(manifest, hashes, key, force, check):
+        stale.append(PACK_MANIFEST_PATH.name)
+
+    if not check:
+        manifest['sources'] = hashes
+        write_manifest(manifest)
+        prune_fragments(manifest['sources'])
+    if verify and verify_data(hashes):
+        print('ERROR: INLINED_DATA does not decode back to data/')
+        sys.exit(1)
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate the inlined payloads in the HTML entry points.')
+    parser.add_argument('--force', action='store_true', help='rebuild every target regardless of the manifest')
+    parser.add_argument('--check', action='store_true', help='report stale targets without writing; exit 1 if any')
+    parser.add_argument('--compress', action='store_true',
+                        help='embed the standalone prompt pack deflate-compressed (needs DecompressionStream)')
+    parser.add_argument('--report', action='store_true', help='print the prompt pack and data size reports')
+    parser.add_argument('--verify', action='store_true',
+                        help='decode INLINED_DATA in every target and compare it with data/; exit 1 on a mismatch')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stale = build(force=args.force, check=args.check, compress=args.compress, report=args.report,
+                  verify=args.verify)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f'\nDone in {elapsed:.0f} ms. {len(stale)} of {len(TARGETS) + 1} outputs {"stale" if args.check else "rebuilt"}.')
+    if args.check and stale:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Validate data/ and prompts/ before they are built into the HTML entry points.
+
+Every data/*.json and prompts/*.json file is loaded and checked against the
+schemas declared below (spread across --jobs worker processes). Then the
+workflow is checked as a graph:
+  - every step's prompt file exists and its prompt_id matches workflow.json;
+  - every depends_on resolves to a step and the step graph is acyclic;
+  - prompt files no step refers to are reported as warnings.
+
+The report lists every error and warning with its file and JSON path, plus the
+topological order of the steps and the critical path (the longest dependency
+chain). Exit status is 1 when any error is found.
+
+Usage:
+  python scripts/check_integrity.py
+  python scripts/check_integrity.py --jobs 8 --report integrity.json
+  python scripts/check_integrity.py --prompts-dir packs/client --fail-fast
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import time
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / 'data'
+PROMPTS_DIR = REPO_ROOT / 'prompts'
+
+STEP_ID = re.compile(r'^P\d+\.\d+$')
+
+# ENGAGEMENT CONTEXT SNAPSHOT fields a step may list in context_fields
+# (PROMPT_CONTEXT_FIELDS in index.html, CONTEXT_FIELDS in render_prompts.py).
+CONTEXT_FIELDS = ('engagement_context', 'industry', 'objectives', 'service_offerings', 'key_risks', 'key_regulations')
+
+# Longer orders are left to the JSON report.
+MAX_PRINTED_STEPS = 40
+
+
+# ── Schemas ──────────────────────────────────────────────────────────────────
+# A schema is one of:
+#   - a type (str, bool): the value must be an instance of it;
+#   - a function: returns an error message, or None when the value is valid;
+#   - [schema]: a list whose items all match schema;
+#   - {key: schema}: an object with those keys; wrap a schema in Opt() when the
+#     key may be absent or null. Keys not in the schema are reported as warnings.
+
+class Opt:
+    """A key that may be absent or null."""
+
+    def __init__(self, schema):
+        self.schema = schema
+
+
+def text(value):
+    if not isinstance(value, str) or not value.strip():
+        return 'expected a non-empty string'
+    return None
+
+
+def step_id(value):
+    if not isinstance(value, str) or not STEP_ID.match(value):
+        return f'expected a step id like "P1.2", got {json.dumps(value)}'
+    return None
+
+
+def context_field(value):
+    if value not in CONTEXT_FIELDS:
+        return f'expected one of {", ".join(CONTEXT_FIELDS)}, got {json.dumps(value)}'
+    return None
+
+
+PROMPT_SCHEMA = {
+    'prompt_id': step_id,
+    'prompt_name': text,
+    'artifact': text,
+    'instruction': text,
+    'applied_transforms': Opt([str]),
+}
+
+# Suggestions in industry_facets.json: a technology sub-category, or a partner
+# (optionally narrowed to one product of a product family).
+FACET_TECHNOLOGY = {'category': text, 'sub_category': text}
+FACET_PARTNER = {'partner': text, 'product_family': Opt(text), 'product': Opt(text)}
+
+DATA_SCHEMAS = {
+    'workflow.json': {
+        'phases': [{
+            'phase_id': text,
+            'phase_name': text,
+            'prompts': [{
+                'prompt_id': step_id,
+                'prompt_name': text,
+                'file': text,
+                'artifact': text,
+                'depends_on': Opt([step_id]),
+                'sign_off_gate': Opt(bool),
+                'context_fields': Opt([context_field]),
+            }],
+        }],
+    },
+    'industries.json': {
+        'industries': [{'industry': text, 'sectors': [{'sector': text, 'sub_sectors': [text]}]}],
+    },
+    'objectives.json': {
+        'engagement_objectives': {
+            'field_type': Opt(str),
+            'objective_types': [{
+                'objective_type': text,
+                'description': Opt(str),
+                'themes': [{'theme': text, 'specific_objectives': [text]}],
+            }],
+        },
+    },
+    'service_offerings.json': {
+        'domains': [{'domain': text, 'building_blocks': [{'building_block': text, 'description': str}]}],
+    },
+    'technologies.json': {
+        'technology_and_tools': {
+            'field_type': Opt(str),
+            'categories': [{'category': text, 'sub_categories': [{'sub_category': text, 'options': [text]}]}],
+        },
+    },
+    'alliance_partners.json': {
+        'alliance_partners': {
+            'field_type': Opt(str),
+            'partners': [{'partner': text, 'product_families': [{'product_family': text, 'products': [text]}]}],
+        },
+    },
+    'regulatory_profile.json': {
+        'regulatory_profile': {
+            'field_type': Opt(str),
+            'description': Opt(str),
+            'industry_groups': [{
+                'industry_group': text,
+                'regulators': [{'regulator': text, 'requirements': [text]}],
+            }],
+        },
+    },
+    'risk_profile.json': {
+        'risk_profile': {
+            'field_type': Opt(str),
+            'description': Opt(str),
+            'risk_rating_options': Opt([text]),
+            'risk_maturity_options': Opt([text]),
+            'industry_groups': [{
+                'industry_group': text,
+                'risk_types': [{'risk_type': text, 'specific_risks': [text]}],
+            }],
+        },
+    },
+    'industry_facets.json': {
+        'industry_facets': {
+            'description': Opt(str),
+            'all_industries_group': text,
+            'industries': [{
+                'industry': text,
+                'groups': Opt([text]),
+                'technologies': Opt([FACET_TECHNOLOGY]),
+                'partners': Opt([FACET_PARTNER]),
+                'sectors': Opt([{
+                    'sector': text,
+                    'groups': Opt([text]),
+                    'technologies': Opt([FACET_TECHNOLOGY]),
+                    'partners': Opt([FACET_PARTNER]),
+                }]),
+            }],
+        },
+    },
+}
+
+TYPE_NAMES = {str: 'string', bool: 'boolean', int: 'integer', list: 'array', dict: 'object'}
+
+
+def validate(value, schema, path, errors, warnings):
+    """Append (path, message) pairs for every mismatch between value and schema."""
+    if isinstance(schema, type):
+        # bool is a subclass of int in Python but not in JSON.
+        if not isinstance(value, schema) or (schema is int and isinstance(value, bool)):
+            errors.append((path, f'expected {TYPE_NAMES.get(schema, schema.__name__)}'))
+    elif isinstance(schema, list):
+        if not isinstance(value, list):
+            errors.append((path, 'expected array'))
+            return
+        for i, item in enumerate(value):
+            validate(item, schema[0], f'{path}[{i}]', errors, warnings)
+    elif isinstance(schema, dict):
+        if not isinstance(value, dict):
+            errors.append((path, 'expected object'))
+            return
+        for key, field in schema.items():
+            optional = isinstance(field, Opt)
+            if value.get(key) is None:
+                if not optional:
+                    errors.append((f'{path}.{key}', 'missing required key'))
+                continue
+            validate(value[key], field.schema if optional else field, f'{path}.{key}', errors, warnings)
+        for key in value:
+            if key not in schema:
+                warnings.append((f'{path}.{key}', 'unexpected key'))
+    else:
+        message = schema(value)
+        if message:
+            errors.append((path, message))
+
+
+# ── Per-file checks (run in worker processes) ────────────────────────────────
+
+def check_file(kind, path):
+    """Load and validate one file.
+
+    Returns (rel, errors, warnings, summary): the messages are (path, message)
+    pairs and summary holds what the graph checks need: the full workflow for
+    workflow.json, the prompt_id for a prompt file, or None.
+    """
+    path = Path(path)
+    rel = f'{kind}/{path.name}'
+    errors, warnings = [], []
+    try:
+        with path.open('r', encoding='utf-8') as fh:
+            doc = json.load(fh)
+    except (OSError, UnicodeDecodeError, ValueError) as exc:
+        return rel, [('$', f'cannot load: {exc}')], [], None
+
+    if kind == 'prompts':
+        validate(doc, PROMPT_SCHEMA, '$', errors, warnings)
+        summary = doc.get('prompt_id') if isinstance(doc, dict) else None
+    else:
+        schema = DATA_SCHEMAS.get(path.name)
+        if schema is None:
+            warnings.append(('$', 'no schema declared for this data file'))
+        else:
+            validate(doc, schema, '$', errors, warnings)
+        summary = doc if path.name == 'workflow.json' and not errors else None
+    return rel, errors, warnings, summary
+
+
+def _check_file(args):
+    return check_file(*args)
+
+
+def load_all(data_dir, prompts_dir, jobs, fail_fast):
+    """Check every file, in parallel when jobs > 1; stop early on the first error with fail_fast."""
+    tasks = [('data', str(p)) for p in sorted(Path(data_dir).glob('*.json'))]
+    tasks += [('prompts', str(p)) for p in sorted(Path(prompts_dir).glob('*.json'))]
+    results = []
+    if jobs > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for result in pool.map(_check_file, tasks, chunksize=chunksize):
+                results.append(result)
+                if fail_fast and result[1]:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
+    else:
+        for task in tasks:
+            results.append(_check_file(task))
+            if fail_fast and results[-1][1]:
+                break
+    return results
+
+
+# ── Workflow graph ───────────────────────────────────────────────────────────
+
+def check_workflow(workflow, prompt_ids, prompts_dir, error, warning):
+    """Cross-check workflow.json against the prompt files and analyse the step graph.
+
+    prompt_ids maps each prompt file name to the prompt_id it declares.
+    Returns the graph section of the report.
+    """
+    steps, order, where = {}, [], {}
+    files = {}
+    for pi, phase in enumerate(workflow['phases']):
+        for si, step in enumerate(phase['prompts']):
+            at = f'$.phases[{pi}].prompts[{si}]'
+            sid = step['prompt_id']
+            if sid in steps:
+                error('data/workflow.json', f'{at}.prompt_id', f'duplicate step id {sid}')
+                continue
+            steps[sid] = step
+            order.append(sid)
+            where[sid] = at
+
+            fname = step['file']
+            if fname in files:
+                warning('data/workflow.json', f'{at}.file', f'{fname} is also used by {files[fname]}')
+            files.setdefault(fname, sid)
+            if not (Path(prompts_dir) / fname).exists():
+                error('data/workflow.json', f'{at}.file', f'prompt file not found: {fname}')
+            elif fname in prompt_ids and prompt_ids[fname] != sid:
+                error(f'prompts/{fname}', '$.prompt_id',
+                      f'prompt_id {prompt_ids[fname]} does not match workflow step {sid}')
+
+    for fname in sorted(set(prompt_ids) - set(files)):
+        warning(f'prompts/{fname}', '$', 'not referenced by any workflow step')
+
+    position = {sid: i for i, sid in enumerate(order)}
+    deps = {}
+    for sid in order:
+        deps[sid] = []
+        for di, dep in enumerate(steps[sid].get('depends_on') or []):
+            if dep not in steps:
+                error('data/workflow.json', f'{where[sid]}.depends_on[{di}]', f'unknown step {dep}')
+            elif dep not in deps[sid]:
+                deps[sid].append(dep)
+
+    # Kahn's algorithm, taking ready steps in workflow order so the result is stable.
+    dependents = {sid: [] for sid in order}
+    remaining = {sid: len(deps[sid]) for sid in order}
+    for sid in order:
+        for dep in deps[sid]:
+            dependents[dep].append(sid)
+    ready = [position[sid] for sid in order if not remaining[sid]]
+    heapq.heapify(ready)
+    topo = []
+    while ready:
+        sid = order[heapq.heappop(ready)]
+        topo.append(sid)
+        for nxt in dependents[sid]:
+            remaining[nxt] -= 1
+            if not remaining[nxt]:
+                heapq.heappush(ready, position[nxt])
+
+    if len(topo) < len(order):
+        # Every unresolved step still waits on another unresolved step, so
+        # following those dependencies must eventually revisit a step.
+        blocked = [sid for sid in order if remaining[sid]]
+        walk, seen = [blocked[0]], {blocked[0]: 0}
+        while True:
+            nxt = next(dep for dep in deps[walk[-1]] if remaining[dep])
+            if nxt in seen:
+                cycle = walk[seen[nxt]:] + [nxt]
+                break
+            seen[nxt] = len(walk)
+            walk.append(nxt)
+        cycle.reverse()
+        error('data/workflow.json', where[cycle[0]] + '.depends_on',
+              f'dependency cycle: {" -> ".join(cycle)} ({len(blocked)} steps blocked)')
+        return {'steps': len(order), 'acyclic': False, 'cycle': cycle, 'blocked': blocked}
+
+    # Longest chain ending at each step; ties keep the earliest dependency.
+    depth, via = {}, {}
+    for sid in topo:
+        best = max(deps[sid], key=lambda d: (depth[d], -position[d]), default=None)
+        depth[sid] = depth[best] + 1 if best else 1
+        via[sid] = best
+    end = max(topo, key=lambda sid: (depth[sid], -position[sid]), default=None)
+    critical = []
+    while end:
+        critical.append(end)
+        end = via[end]
+    critical.reverse()
+
+    return {
+        'steps': len(order),
+        'acyclic': True,
+        'topological_order': topo,
+        'critical_path': critical,
+        'critical_path_depth': len(critical),
+    }
+
+
+# ── Main ─────────────────────────────────────────────────────────────────────
+
+def check(data_dir=DATA_DIR, prompts_dir=PROMPTS_DIR, jobs=1, fail_fast=False):
+    """Run every check; returns the report dict."""
+    started = time.perf_counter()
+    errors, warnings = [], []
+
+    def error(file, path, message):
+        errors.append({'file': file, 'path': path, 'message': message})
+
+    def warning(file, path, message):
+        warnings.append({'file': file, 'path': path, 'message': message})
+
+    results = load_all(data_dir, prompts_dir, jobs, fail_fast)
+    workflow, prompt_ids = None, {}
+    for rel, file_errors, file_warnings, summary in results:
+        for path, message in file_errors:
+            error(rel, path, message)
+        for path, message in file_warnings:
+            warning(rel, path, message)
+        if rel == 'data/workflow.json':
+            workflow = summary
+        elif rel.startswith('prompts/') and summary is not None:
+            prompt_ids[rel[len('prompts/'):]] = summary
+
+    graph = None
+    stopped = fail_fast and bool(errors)
+    if workflow is not None and not stopped:
+        graph = check_workflow(workflow, prompt_ids, prompts_dir, error, warning)
+    elif workflow is None and not any(e['file'] == 'data/workflow.json' for e in errors):
+        error('data/workflow.json', '$', 'file not found')
+
+    return {
+        'ok': not errors,
+        'files_checked': len(results),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        'errors': errors,
+        'warnings': warnings,
+        'graph': graph,
+    }
+
+
+def print_report(report):
+    for level in ('errors', 'warnings'):
+        label = 'ERROR' if level == 'errors' else 'WARNING'
+        for item in report[level]:
+            print(f'  {label}: {item["file"]}: {item["path"]}: {item["message"]}')
+    graph = report['graph']
+    if graph and graph['acyclic']:
+        if graph['steps'] <= MAX_PRINTED_STEPS:
+            print(f'\n  Topological order: {" -> ".join(graph["topological_order"])}')
+        else:
+            print(f'\n  Topological order: {graph["steps"]} steps (see --report)')
+        print(f'  Critical path ({graph["critical_path_depth"]} steps): {" -> ".join(graph["critical_path"])}')
+    print(f'\nDone in {report["elapsed_ms"]:.0f} ms. {report["files_checked"]} files checked, '
+          f'{len(report["errors"])} error(s), {len(report["warnings"])} warning(s).')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate data/ and prompts/ and analyse the workflow graph.')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR, help=f'default: {DATA_DIR}')
+    parser.add_argument('--prompts-dir', type=Path, default=PROMPTS_DIR, help=f'default: {PROMPTS_DIR}')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, metavar='N',
+                        help='number of worker processes (default: CPU count)')
+    parser.add_argument('--fail-fast', action='store_true', help='stop at the first file with an error')
+    parser.add_argument('--report', type=Path, metavar='FILE',
+                        help='write the JSON report to FILE ("-" for stdout)')
+    args = parser.parse_args()
+
+    for directory in (args.data_dir, args.prompts_dir):
+        if not directory.is_dir():
+            print(f'ERROR: directory not found: {directory}')
+            sys.exit(1)
+
+    report = check(args.data_dir, args.prompts_dir, max(1, args.jobs), args.fail_fast)
+
+    if args.report and str(args.report) == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print_report(report)
+        if args.report:
+            with args.report.open('w', encoding='utf-8') as fh:
+                json.dump(report, fh, indent=2)
+            print(f'Report written to {args.report}')
+
+    if not report['ok']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,891 @@
+#!/usr/bin/env python3
+"""
+Run the PMO Playbook's cross-document consistency audit locally, over the
+artifacts the workflow steps produced.
+
+pmo_playbook.json (CONSISTENCY_AUDIT in update_prompts.py) asks the model to
+cross-check every planning document before it builds the playbook. This script
+runs the same checks without a model:
+  1. Each step's artifact is read from DIR/<STEP>.<ext> (for example P2.2.md),
+     as render_prompts.py --artifacts reads them: Markdown or text, whose
+     tables are read by their header row, or CSV.
+  2. Every line is read once and the entities the checks need are indexed as
+     it streams past: workstreams, WBS elements, scope inclusions and
+     exclusions, engagement dates, milestones, roles, effort, monthly totals,
+     governance bodies, escalation paths, approvers, owners, risk IDs and open
+     items. Columns are recognised by their header (COLUMN_KINDS) and lists by
+     the heading above them.
+  3. The checks run against the index and each gives PASS, FAIL or WARNING
+     with a finding, or is not checked when an artifact it needs is missing,
+     is not UTF-8 text or holds nothing it recognises.
+
+--markdown writes the result as a section to paste after the P2.13 prompt:
+the FAIL and WARNING findings in the table the playbook asks for, every
+check's result, and the Master Open Items table. Names are compared after
+lower-casing and dropping punctuation; the fuzzy checks (scope coverage,
+roles, owners) only ever WARN. Exit status is 1 when any check FAILs.
+
+Usage:
+  python scripts/consistency_audit.py outputs/
+  python scripts/consistency_audit.py outputs/ --markdown audit.md
+  python scripts/consistency_audit.py outputs/ --report audit.json
+"""
+
+import argparse
+import csv
+from datetime import date
+import json
+from pathlib import Path
+import re
+import sys
+import time
+
+import render_prompts
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / 'data'
+
+# Effort in the Resource Plan and the Budget must agree within this fraction.
+EFFORT_TOLERANCE = 0.05
+# More FAIL findings than this put the playbook's warning banner on the section.
+BANNER_FAILS = 5
+BANNER = ('⚠️ Significant planning inconsistencies detected. Resolve all FAIL items before distributing '
+          'this playbook. Known conflicts are in the Consistency Audit section.')
+
+
+# ── Text helpers ─────────────────────────────────────────────────────────────
+
+_MARKUP = re.compile(r'[*_`~]+')
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+STOPWORDS = frozenset('a an and the of for to in on with by or at from per via all any'.split())
+
+
+def clean(text):
+    """Cell or line text without Markdown emphasis and surrounding space."""
+    return _MARKUP.sub('', text).strip()
+
+
+def norm(text):
+    """Lower-case words separated by single spaces, for comparing names."""
+    return _NON_WORD.sub(' ', clean(text).lower()).strip()
+
+
+def words(text):
+    return {word for word in norm(text).split() if word not in STOPWORDS}
+
+
+def similar(a, b, threshold=0.5):
+    """True when most significant words of the shorter name are in the other.
+
+    Names of more than one word must share at least two, so one common word
+    ("finance") does not make two names alike.
+    """
+    wa, wb = words(a), words(b)
+    if not wa or not wb:
+        return False
+    shared = len(wa & wb)
+    return shared >= min(2, len(wa), len(wb)) and shared / min(len(wa), len(wb)) >= threshold
+
+
+MONTHS = {name: i for i, name in enumerate(
+    'jan feb mar apr may jun jul aug sep oct nov dec'.split(), 1)}
+_MONTH_NAME = r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+DATE_FORMS = (
+    (re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b'), lambda m: (m[1], m[2], m[3])),
+    (re.compile(r'\b(\d{1,2})/(\d{1,2})/(\d{4})\b'), lambda m: (m[3], m[2], m[1])),
+    (re.compile(rf'\b(\d{{1,2}})(?:st|nd|rd|th)?\s+{_MONTH_NAME},?\s+(\d{{4}})\b', re.I),
+     lambda m: (m[3], MONTHS[m[2].lower()], m[1])),
+    (re.compile(rf'\b{_MONTH_NAME}\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b', re.I),
+     lambda m: (m[3], MONTHS[m[1].lower()], m[2])),
+)
+MONTH_FORMS = (
+    (re.compile(rf'^{_MONTH_NAME}[\s\-\']*(\d{{4}}|\d{{2}})$', re.I),
+     lambda m: f'{int(m[2]) % 100 + 2000 if len(m[2]) == 2 else int(m[2])}-{MONTHS[m[1].lower()]:02d}'),
+    (re.compile(r'^(\d{4})-(\d{2})$'), lambda m: f'{m[1]}-{m[2]}'),
+    (re.compile(r'^(?:m|month)\s*(\d{1,2})$', re.I), lambda m: f'M{int(m[1])}'),
+)
+_NUMBER = re.compile(r'-?\d[\d,]*(?:\.\d+)?')
+
+
+def parse_date(text):
+    """The first date written in text, day first when numeric; None if none."""
+    for pattern, parts in DATE_FORMS:
+        for match in pattern.finditer(text):
+            try:
+                year, month, day = (int(part) for part in parts(match))
+                return date(year, month, day)
+            except ValueError:
+                continue
+    return None
+
+
+def parse_month(header):
+    """'2026-01' for a calendar-month column header, 'M3' for a relative one."""
+    text = clean(header)
+    for pattern, key in MONTH_FORMS:
+        match = pattern.match(text)
+        if match:
+            return key(match)
+    return None
+
+
+def parse_number(text):
+    match = _NUMBER.search(clean(text).replace(' ', ''))
+    return float(match.group().replace(',', '')) if match else None
+
+
+# ── Parsing ──────────────────────────────────────────────────────────────────
+# Column header (normalised) -> kind, first match wins.
+COLUMN_KINDS = (
+    ('blocks', re.compile(r'\bblocks?\b.*\b(delivery|start)\b|\bblocker\b')),
+    ('id', re.compile(r'^(id|ref|reference|no|item no|number|wbs|wbs code|wbs id)$|\b(id|ref)$')),
+    ('level', re.compile(r'^(wbs )?level$')),
+    ('workstream', re.compile(r'\bworkstreams?\b')),
+    ('start', re.compile(r'\bstart\b')),
+    ('end', re.compile(r'\b(end|finish|completion)\b')),
+    ('date', re.compile(r'\b(date|due|deadline|target)\b')),
+    ('milestone', re.compile(r'\bmilestones?\b')),
+    ('escalation', re.compile(r'\bescalat')),
+    ('approver', re.compile(r'\b(approv\w*|authority|decision makers?|sign off)\b')),
+    ('owner', re.compile(r'\b(owner|assigned to|action by)\b')),
+    ('status', re.compile(r'\bstatus\b')),
+    ('role', re.compile(r'\b(roles?|positions?)\b')),
+    ('body', re.compile(r'\b(body|bodies|forum|committee|board|governance)\b')),
+    ('days', re.compile(r'\b(days|hours|effort)\b')),
+    ('in_scope', re.compile(r'^in scope\b|\binclusions?\b')),
+    ('out_scope', re.compile(r'\bout of scope\b|\bexclusions?\b')),
+    ('element', re.compile(r'\b(wbs element|element|work package|deliverable|name|title)\b')),
+    ('text', re.compile(r'\b(description|item|issue|question|action|risk|dependency|summary|detail)s?\b')),
+)
+_TABLE_SEPARATOR = re.compile(r'[|:\- \t]+')
+_HEADING = re.compile(r'(#{1,6})[ \t]+(.+?)[ \t#]*$')
+_BULLET = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+(.+)$')
+_FIELD = re.compile(r'^\s*(?:[-*+]\s+)?([A-Za-z][\w /&()\-]{1,40}?)\s*:\s*(.+)$')
+_RACI_CODE = re.compile(r'^[RACI](\s*[/,]\s*[RACI])*$')
+_RISK_ID = re.compile(r'\bR(?:ISK)?-?\d{1,4}\b', re.I)
+_WBS_LEVEL_2 = re.compile(r'^\d+\.\d+$')
+
+OPEN_STATUSES = ('open', 'pending', 'in progress', 'ongoing', 'tbc', 'tbd', 'unresolved', 'outstanding',
+                 'not started', 'awaiting', 'new', 'raised', 'active')
+CLOSED_STATUSES = ('closed', 'resolved', 'done', 'complete', 'agreed', 'accepted', 'approved', 'mitigated',
+                   'cancelled', 'withdrawn')
+BODY_WORDS = re.compile(r'\b(board|committee|forum|council|steerco|steering)\b', re.I)
+
+
+def risk_id(text):
+    """'R-007' for R7, R-007 and RISK-7."""
+    return 'R-%03d' % int(re.search(r'\d+', text).group())
+
+
+def column_kind(header):
+    if parse_month(header):
+        return 'month'
+    text = norm(header)
+    for kind, pattern in COLUMN_KINDS:
+        if pattern.search(text):
+            return kind
+    return None
+
+
+def status_of(text):
+    text = norm(text)
+    if text.startswith(CLOSED_STATUSES):
+        return 'closed'
+    if text.startswith(OPEN_STATUSES):
+        return 'open'
+    return None
+
+
+def split_row(line):
+    return [clean(cell) for cell in line.strip().strip('|').split('|')]
+
+
+def artifact_events(path):
+    """Stream (kind, heading, payload) events from one artifact, line by line.
+
+    Kinds: 'table' (a header row: payload is the cells), 'row' (payload is
+    the cells), 'end' (the table before it ended), 'bullet' and 'field'
+    ((key, value)); every line is also passed on as 'line' for the mention
+    checks.
+    """
+    with path.open('r', encoding='utf-8-sig', newline='') as fh:
+        if path.suffix.lower() == '.csv':
+            reader = csv.reader(fh)
+            header = next(reader, None)
+            if header:
+                yield 'table', '', [clean(cell) for cell in header]
+                for row in reader:
+                    yield 'line', '', ' '.join(row)
+                    yield 'row', '', [clean(cell) for cell in row]
+                yield 'end', '', None
+            return
+        heading = ''
+        in_table = False
+        for raw in fh:
+            line = raw.strip()
+            yield 'line', heading, line
+            if line.startswith('|'):
+                if _TABLE_SEPARATOR.fullmatch(line):
+                    continue
+                yield ('row' if in_table else 'table'), heading, split_row(line)
+                in_table = True
+                continue
+            if in_table:
+                yield 'end', heading, None
+            in_table = False
+            match = _HEADING.match(line)
+            if match:
+                heading = clean(match.group(2))
+                continue
+            match = _FIELD.match(clean(line))
+            if match:
+                yield 'field', heading, (match.group(1), match.group(2))
+            match = _BULLET.match(line)
+            if match:
+                yield 'bullet', heading, clean(match.group(1))
+        if in_table:
+            yield 'end', heading, None
+
+
+# ── Index ────────────────────────────────────────────────────────────────────
+
+class Document:
+    """The entities one step's artifact mentions."""
+
+    def __init__(self, step, path):
+        self.step = step
+        self.path = path
+        self.text = []
+        self.fields = {}
+        self.lists = []          # (heading, item)
+        self.workstreams = {}
+        self.wbs_level_2 = {}
+        self.elements = []
+        self.scope_in = []
+        self.scope_out = []
+        self.milestones = {}     # norm name -> (name, date)
+        self.ranges = []         # (start, end) of rows with start and end columns
+        self.roles = {}
+        self.raci_roles = {}
+        self.effort = None       # (days, from a total row)
+        self.monthly = {}        # month key -> total
+        self.bodies = {}
+        self.escalations = []
+        self.approvers = []
+        self.owners = []
+        self.risk_ids = set()
+        self.risk_refs = set()
+        self.items = []
+
+    def mentions(self, name):
+        return f' {norm(name)} ' in self.joined
+
+    def finish(self):
+        self.joined = f' {norm(" ".join(self.text))} '
+        del self.text
+        if not self.workstreams:
+            for heading, item in self.lists:
+                if 'workstream' in heading:
+                    self.workstreams.setdefault(norm(item), item)
+        for heading, item in self.lists:
+            if re.search(r'\b(in scope|inclusions?)\b', heading):
+                self.scope_in.append(item)
+            elif re.search(r'\b(out of scope|exclusions?)\b', heading):
+                self.scope_out.append(item)
+            elif re.search(r'\b(governance bodies|forums?|committees?|boards?)\b', heading):
+                self.bodies.setdefault(norm(item), item)
+
+
+class TableIndexer:
+    """Feeds the rows of one table into a Document by column kind."""
+
+    def __init__(self, doc, heading, header):
+        self.doc = doc
+        self.heading = heading
+        self.header = header
+        self.kinds = [column_kind(cell) for cell in header]
+        self.rows = []
+
+    def add(self, row):
+        if not any(row):
+            return
+        doc, cells = self.doc, {}
+        for kind, cell in zip(self.kinds, row):
+            if kind and cell and kind not in cells:
+                cells[kind] = cell
+        col = lambda kind: cells.get(kind, '')
+        self.rows.append(row)
+        if len(row) == 2 and row[0] and row[1]:
+            doc.fields.setdefault(norm(row[0]), row[1])
+        label = col('element') or col('text') or col('milestone') or next(
+            (cell for cell, kind in zip(row, self.kinds) if cell and kind not in ('id', 'level')), '')
+        workstream = col('workstream')
+        if workstream:
+            doc.workstreams.setdefault(norm(workstream), workstream)
+        if col('level') == '2' or _WBS_LEVEL_2.match(col('id')):
+            doc.wbs_level_2.setdefault(norm(label), label)
+        if col('element'):
+            doc.elements.append(col('element'))
+        for kind, target in (('in_scope', doc.scope_in), ('out_scope', doc.scope_out)):
+            if col(kind):
+                target.append(col(kind))
+        milestone = col('milestone')
+        when = parse_date(col('date') or col('end') or col('start'))
+        if milestone and when:
+            doc.milestones.setdefault(norm(milestone), (milestone, when))
+        start, end = parse_date(col('start')), parse_date(col('end'))
+        if start and end:
+            doc.ranges.append((start, end))
+        if col('role'):
+            doc.roles.setdefault(norm(col('role')), col('role'))
+        if col('body'):
+            doc.bodies.setdefault(norm(col('body')), col('body'))
+        for kind, target in (('escalation', doc.escalations), ('approver', doc.approvers), ('owner', doc.owners)):
+            if col(kind):
+                target.append(col(kind))
+        ident = col('id')
+        if _RISK_ID.fullmatch(ident):
+            # Risks are tracked in the register, not as open items.
+            doc.risk_ids.add(risk_id(ident))
+            return
+        status = status_of(col('status')) if col('status') else None
+        blocks = norm(col('blocks')) in ('y', 'yes', 'true')
+        if status or blocks:
+            doc.items.append({'id': ident, 'item': label, 'owner': col('owner'),
+                              'status': status or 'open', 'blocks': blocks, 'step': doc.step['prompt_id']})
+
+    def finish(self):
+        doc = self.doc
+        body = [row for row in self.rows if not norm(row[0]).startswith('total')]
+        codes = [cell for row in body for cell in row[1:] if cell]
+        if codes and sum(1 for cell in codes if _RACI_CODE.match(cell)) >= len(codes) / 2:
+            for cell in self.header[1:]:
+                if cell and column_kind(cell) is None:
+                    doc.raci_roles.setdefault(norm(cell), cell)
+        for i, kind in enumerate(self.kinds):
+            if kind == 'days' and doc.effort is None:
+                scale = 1 / 8 if 'hour' in norm(self.header[i]) else 1
+                total = next((parse_number(row[i]) for row in self.rows
+                              if norm(row[0]).startswith('total') and i < len(row) and parse_number(row[i])), None)
+                values = [parse_number(row[i]) for row in body if i < len(row)]
+                values = [value for value in values if value is not None]
+                if total is not None:
+                    doc.effort = (total * scale, True)
+                elif values:
+                    doc.effort = (sum(values) * scale, False)
+        months = [(i, parse_month(cell)) for i, cell in enumerate(self.header) if self.kinds[i] == 'month']
+        if len(months) >= 2 and not doc.monthly:
+            for i, key in months:
+                doc.monthly[key] = sum(parse_number(row[i]) or 0 for row in body if i < len(row))
+
+
+def index_artifact(step, path):
+    """Read one artifact in a single pass and index what it mentions."""
+    doc = Document(step, path)
+    table = None
+    for kind, heading, payload in artifact_events(path):
+        if kind == 'line':
+            doc.text.append(payload)
+            doc.risk_refs.update(risk_id(ref) for ref in _RISK_ID.findall(payload))
+            if not table and re.search(r'blocks delivery start\W+(y|yes)\b', payload, re.I):
+                doc.items.append({'id': '', 'item': clean(payload), 'owner': '', 'status': 'open',
+                                  'blocks': True, 'step': step['prompt_id']})
+        elif kind == 'table':
+            table = TableIndexer(doc, norm(heading), payload)
+        elif kind == 'row':
+            table.add(payload)
+        elif kind == 'end':
+            table.finish()
+            table = None
+        elif kind == 'field':
+            doc.fields.setdefault(norm(payload[0]), payload[1])
+        elif kind == 'bullet':
+            doc.lists.append((norm(heading), payload))
+    doc.finish()
+    return doc
+
+
+def find_artifacts(workflow, artifacts_dir):
+    """{step id: path} for every step with an artifact, as render_prompts.py finds them."""
+    found = {}
+    for step in render_prompts.workflow_steps(workflow):
+        path = render_prompts.find_artifact(artifacts_dir, step['prompt_id'])
+        if path:
+            found[step['prompt_id']] = path
+    return found
+
+
+# ── Checks ───────────────────────────────────────────────────────────────────
+
+class Audit:
+    def __init__(self, docs, unreadable=()):
+        self.docs = docs
+        self.unreadable = set(unreadable)
+        self.checks = []
+
+    def absent(self, step_ids):
+        """Why the artifacts of step_ids are not indexed: missing or unreadable."""
+        reasons = []
+        unreadable = [step_id for step_id in step_ids if step_id in self.unreadable]
+        missing = [step_id for step_id in step_ids if step_id not in self.unreadable]
+        if missing:
+            reasons.append(f'no artifact for {", ".join(missing)}')
+        if unreadable:
+            reasons.append(f'unreadable artifact for {", ".join(unreadable)}')
+        return '; '.join(reasons)
+
+    def doc(self, step_id):
+        return self.docs.get(step_id)
+
+    def record(self, group, check, docs, status, finding='', resolution='', blocks=False):
+        self.checks.append({'group': group, 'check': check, 'documents': list(docs), 'status': status,
+                            'finding': finding, 'resolution': resolution, 'blocks_delivery_start': blocks})
+
+    def skip(self, group, check, docs, reason):
+        self.record(group, check, docs, 'NOT CHECKED', reason)
+
+    def needs(self, group, check, step_ids, has):
+        """The documents for step_ids when each exists and has(doc) holds; otherwise records why not."""
+        docs = [self.doc(step_id) for step_id in step_ids]
+        missing = [step_id for step_id, doc in zip(step_ids, docs) if doc is None]
+        if missing:
+            self.skip(group, check, step_ids, self.absent(missing))
+            return None
+        empty = [doc.step['prompt_id'] for doc in docs if not has(doc)]
+        if empty:
+            self.skip(group, check, step_ids, f'nothing recognised in {", ".join(empty)}')
+            return None
+        return docs
+
+
+def field_date(doc, *keys):
+    for key, value in doc.fields.items():
+        if any(re.search(pattern, key) for pattern in keys):
+            when = parse_date(value)
+            if when:
+                return when
+    return None
+
+
+START_KEYS = (r'^(engagement |project |programme )?start( date)?$', r'\bstart date\b')
+END_KEYS = (r'^(engagement |project |programme )?(end|finish|completion)( date)?$', r'\b(end|completion) date\b')
+
+
+def listed(names, limit=6):
+    names = sorted(names)
+    shown = ', '.join(names[:limit])
+    return shown + (f' and {len(names) - limit} more' if len(names) > limit else '')
+
+
+def check_scope(audit):
+    group = 'Scope Consistency'
+    wbs = lambda doc: doc.wbs_level_2 or doc.workstreams
+    for other, name in (('P1.3', 'Scope Statement'), ('P1.5', 'Engagement Charter')):
+        check = f'WBS Level 2 workstreams (P2.1) match the {name} ({other})'
+        docs = audit.needs(group, check, ['P2.1', other], lambda doc: wbs(doc) if doc.step['prompt_id'] == 'P2.1'
+                           else doc.workstreams)
+        if not docs:
+            continue
+        level_2 = {key: value for key, value in wbs(docs[0]).items()}
+        listed_there = docs[1].workstreams
+        only_wbs = [level_2[key] for key in level_2 if key not in listed_there]
+        only_other = [listed_there[key] for key in listed_there if key not in level_2]
+        if only_wbs or only_other:
+            parts = []
+            if only_other:
+                parts.append(f'in {other} but not the WBS: {listed(only_other)}')
+            if only_wbs:
+                parts.append(f'in the WBS but not {other}: {listed(only_wbs)}')
+            audit.record(group, check, ['P2.1', other], 'FAIL', 'Workstreams differ — ' + '; '.join(parts) + '.',
+                         f'Align the Level 2 WBS elements with the {name} workstreams.')
+        else:
+            audit.record(group, check, ['P2.1', other], 'PASS')
+
+    check = 'Every scope inclusion (P1.3) has a WBS element (P2.1)'
+    docs = audit.needs(group, check, ['P1.3', 'P2.1'],
+                       lambda doc: doc.scope_in if doc.step['prompt_id'] == 'P1.3' else doc.elements or wbs(doc))
+    if docs:
+        elements = docs[1].elements + list(wbs(docs[1]).values())
+        uncovered = [item for item in docs[0].scope_in if not any(similar(item, element) for element in elements)]
+        if uncovered:
+            audit.record(group, check, ['P1.3', 'P2.1'], 'WARNING',
+                         f'No WBS element resembles {len(uncovered)} inclusion(s): {listed(uncovered, 4)}.',
+                         'Add WBS elements for these inclusions, or confirm where they are delivered.')
+        else:
+            audit.record(group, check, ['P1.3', 'P2.1'], 'PASS')
+
+    check = 'No scope exclusion (P1.3) appears in the WBS (P2.1)'
+    docs = audit.needs(group, check, ['P1.3', 'P2.1'],
+                       lambda doc: doc.scope_out if doc.step['prompt_id'] == 'P1.3' else doc.elements or wbs(doc))
+    if docs:
+        elements = docs[1].elements + list(wbs(docs[1]).values())
+        present = [f'"{item}" ~ "{element}"' for item in docs[0].scope_out
+                   for element in elements if similar(item, element, 0.8)]
+        if present:
+            audit.record(group, check, ['P1.3', 'P2.1'], 'WARNING',
+                         f'WBS elements resemble excluded scope: {listed(present, 4)}.',
+                         'Remove the excluded work from the WBS or raise a change request.')
+        else:
+            audit.record(group, check, ['P1.3', 'P2.1'], 'PASS')
+
+
+def check_dates(audit):
+    group = 'Date Consistency'
+    for label, keys in (('start', START_KEYS), ('end', END_KEYS)):
+        check = f'Engagement {label} date in the Schedule (P2.2) matches the Charter (P1.5)'
+        docs = audit.needs(group, check, ['P2.2', 'P1.5'], lambda doc: field_date(doc, *keys))
+        if not docs:
+            continue
+        schedule, charter = (field_date(doc, *keys) for doc in docs)
+        if schedule != charter:
+            audit.record(group, check, ['P2.2', 'P1.5'], 'FAIL',
+                         f'Schedule {label} date {schedule.isoformat()} differs from the Charter\'s '
+                         f'{charter.isoformat()}.', f'Agree one {label} date and update both documents.')
+        else:
+            audit.record(group, check, ['P2.2', 'P1.5'], 'PASS')
+
+    check = 'Resource Plan dates (P2.4) fall within the Schedule (P2.2)'
+    docs = audit.needs(group, check, ['P2.4', 'P2.2'],
+                       lambda doc: doc.ranges if doc.step['prompt_id'] == 'P2.4'
+                       else field_date(doc, *START_KEYS) and field_date(doc, *END_KEYS))
+    if docs:
+        start, end = field_date(docs[1], *START_KEYS), field_date(docs[1], *END_KEYS)
+        outside = [(a, b) for a, b in docs[0].ranges if a < start or b > end]
+        if outside:
+            first, last = min(a for a, _ in outside), max(b for _, b in outside)
+            audit.record(group, check, ['P2.4', 'P2.2'], 'FAIL',
+                         f'{len(outside)} resource assignment(s) run {first.isoformat()} to {last.isoformat()}, '
+                         f'outside the schedule {start.isoformat()} to {end.isoformat()}.',
+                         'Re-phase the resource assignments or extend the schedule.')
+        else:
+            audit.record(group, check, ['P2.4', 'P2.2'], 'PASS')
+
+    check = 'Milestone dates agree between the Schedule (P2.2) and Critical Path (P2.3)'
+    docs = audit.needs(group, check, ['P2.2', 'P2.3'], lambda doc: doc.milestones)
+    if docs:
+        schedule, critical = docs[0].milestones, docs[1].milestones
+        shared = [key for key in schedule if key in critical]
+        differ = [f'{schedule[key][0]} ({schedule[key][1].isoformat()} vs {critical[key][1].isoformat()})'
+                  for key in shared if schedule[key][1] != critical[key][1]]
+        if differ:
+            audit.record(group, check, ['P2.2', 'P2.3'], 'FAIL',
+                         f'{len(differ)} milestone date(s) differ: {listed(differ, 4)}.',
+                         'Re-baseline the critical path against the schedule.')
+        elif not shared:
+            audit.record(group, check, ['P2.2', 'P2.3'], 'WARNING',
+                         'No milestone appears under the same name in both documents.',
+                         'Use the schedule\'s milestone names in the critical path analysis.')
+        else:
+            audit.record(group, check, ['P2.2', 'P2.3'], 'PASS')
+
+
+def check_resources(audit):
+    group = 'Resource and Budget Consistency'
+    check = 'RACI roles (P2.5) correspond to Resource Plan roles (P2.4)'
+    docs = audit.needs(group, check, ['P2.5', 'P2.4'],
+                       lambda doc: doc.raci_roles or doc.roles if doc.step['prompt_id'] == 'P2.5' else doc.roles)
+    if docs:
+        raci = docs[0].raci_roles or docs[0].roles
+        unknown = [name for key, name in raci.items()
+                   if key not in docs[1].roles and not any(similar(name, role, 0.8) for role in docs[1].roles.values())]
+        if unknown:
+            audit.record(group, check, ['P2.5', 'P2.4'], 'WARNING',
+                         f'RACI roles not in the Resource Plan: {listed(unknown)}.',
+                         'Map each RACI role to a resourced role, or add it to the Resource Plan.')
+        else:
+            audit.record(group, check, ['P2.5', 'P2.4'], 'PASS')
+
+    check = f'Resource Plan effort (P2.4) matches the Budget (P2.6) within {EFFORT_TOLERANCE:.0%}'
+    docs = audit.needs(group, check, ['P2.4', 'P2.6'], lambda doc: doc.effort)
+    if docs:
+        resource, budget = docs[0].effort[0], docs[1].effort[0]
+        gap = abs(resource - budget) / max(resource, budget) if max(resource, budget) else 0
+        if gap > EFFORT_TOLERANCE:
+            audit.record(group, check, ['P2.4', 'P2.6'], 'FAIL',
+                         f'Resource Plan effort {resource:,.1f} days vs Budget {budget:,.1f} days ({gap:.1%} apart).',
+                         'Rebuild the budget from the current resource loading.')
+        else:
+            audit.record(group, check, ['P2.4', 'P2.6'], 'PASS')
+
+    check = 'Budget cost peak (P2.6) falls in the Resource loading peak month (P2.4)'
+    docs = audit.needs(group, check, ['P2.6', 'P2.4'], lambda doc: doc.monthly)
+    if docs:
+        budget, resource = docs[0].monthly, docs[1].monthly
+        if set(budget).isdisjoint(resource):
+            audit.skip(group, check, ['P2.6', 'P2.4'], 'the two documents label their months differently')
+        else:
+            budget_peak = max(budget, key=budget.get)
+            resource_peak = max(resource, key=resource.get)
+            if budget_peak != resource_peak:
+                audit.record(group, check, ['P2.6', 'P2.4'], 'WARNING',
+                             f'Costs peak in {budget_peak} but resource loading peaks in {resource_peak}.',
+                             'Check the budget phasing against the resource loading table.')
+            else:
+                audit.record(group, check, ['P2.6', 'P2.4'], 'PASS')
+
+
+def check_governance(audit):
+    group = 'Governance Consistency'
+    check = 'Every governance body (P1.6) is in the Communications Plan (P2.9)'
+    docs = audit.needs(group, check, ['P1.6', 'P2.9'],
+                       lambda doc: doc.bodies if doc.step['prompt_id'] == 'P1.6' else True)
+    if docs:
+        missing = [name for name in docs[0].bodies.values() if not docs[1].mentions(name)]
+        if missing:
+            audit.record(group, check, ['P1.6', 'P2.9'], 'WARNING',
+                         f'Not in the Communications Plan: {listed(missing)}.',
+                         'Add a communication line for each governance body.')
+        else:
+            audit.record(group, check, ['P1.6', 'P2.9'], 'PASS')
+
+    for step_id, name in (('P2.7', 'Risk Register'), ('P2.8', 'Issue Log')):
+        check = f'{name} escalation paths ({step_id}) name governance bodies in P1.6'
+        docs = audit.needs(group, check, [step_id, 'P1.6'],
+                           lambda doc: doc.escalations if doc.step['prompt_id'] == step_id else doc.bodies)
+        if not docs:
+            continue
+        bodies = docs[1].bodies.values()
+        unknown = sorted({path for path in docs[0].escalations
+                          if BODY_WORDS.search(path) and not any(similar(body, path, 0.8) for body in bodies)})
+        if unknown:
+            audit.record(group, check, [step_id, 'P1.6'], 'FAIL',
+                         f'Escalation to bodies the Governance Framework does not define: {listed(unknown)}.',
+                         'Point escalations at the bodies in P1.6, or add the missing body there.')
+        else:
+            audit.record(group, check, [step_id, 'P1.6'], 'PASS')
+
+    check = 'Change Control approvers (P2.12) appear in the RACI (P2.5) or Governance Framework (P1.6)'
+    docs = audit.needs(group, check, ['P2.12', 'P2.5', 'P1.6'],
+                       lambda doc: doc.approvers if doc.step['prompt_id'] == 'P2.12' else True)
+    if docs:
+        known = list(docs[1].raci_roles.values()) + list(docs[1].roles.values()) + list(docs[2].bodies.values())
+        unknown = sorted({name for name in docs[0].approvers
+                          if not any(similar(name, other, 0.8) for other in known)})
+        if unknown:
+            audit.record(group, check, ['P2.12', 'P2.5', 'P1.6'], 'WARNING',
+                         f'Decision makers not found in the RACI or governance bodies: {listed(unknown)}.',
+                         'Name approvers by their RACI role or governance body.')
+        else:
+            audit.record(group, check, ['P2.12', 'P2.5', 'P1.6'], 'PASS')
+
+    check = 'Risk IDs referenced elsewhere exist in the Risk Register (P2.7)'
+    register = audit.doc('P2.7')
+    if register is None or not register.risk_ids:
+        audit.skip(group, check, ['P2.7'], audit.absent(['P2.7']) if register is None
+                   else 'nothing recognised in P2.7')
+    else:
+        dangling = {}
+        for doc in audit.docs.values():
+            if doc is not register:
+                for ref in doc.risk_refs - register.risk_ids:
+                    dangling.setdefault(ref, []).append(doc.step['prompt_id'])
+        if dangling:
+            steps = sorted({step for refs in dangling.values() for step in refs})
+            audit.record(group, check, ['P2.7'] + steps, 'FAIL',
+                         f'Referenced but not in the Risk Register: {listed(dangling)}.',
+                         'Add the missing risks to the register or correct the references.')
+        else:
+            audit.record(group, check, ['P2.7'], 'PASS')
+
+    check = 'Risk and issue owners are known stakeholders or roles (P1.2, P2.4, P2.5)'
+    owners_docs = [doc for doc in (audit.doc('P2.7'), audit.doc('P2.8')) if doc and doc.owners]
+    known_docs = [doc for doc in (audit.doc('P1.2'), audit.doc('P2.4'), audit.doc('P2.5')) if doc]
+    if not owners_docs or not known_docs:
+        audit.skip(group, check, ['P2.7', 'P2.8'], 'no owners, or no stakeholder, resource or RACI artifact')
+    else:
+        roles = [role for doc in known_docs for role in list(doc.roles.values()) + list(doc.raci_roles.values())]
+        owners = {owner for doc in owners_docs for owner in doc.owners}
+        unknown = sorted(owner for owner in owners
+                         if not any(known.mentions(owner) for known in known_docs)
+                         and not any(similar(owner, role, 0.8) for role in roles))
+        steps = [doc.step['prompt_id'] for doc in owners_docs]
+        if unknown:
+            audit.record(group, check, steps, 'WARNING', f'Owners not found elsewhere: {listed(unknown)}.',
+                         'Assign owners who are named stakeholders or resourced roles.')
+        else:
+            audit.record(group, check, steps, 'PASS')
+
+
+def item_key(item):
+    return norm(item['id']) or norm(item['item'])
+
+
+def check_open_items(audit, order):
+    group = 'Open Items Consolidation'
+    items = [item for step_id in order if step_id in audit.docs for item in audit.docs[step_id].items]
+    latest = {}
+    for item in items:
+        latest[item_key(item)] = item
+    open_items = [item for item in latest.values() if item['status'] == 'open']
+    audit.open_items = open_items
+
+    # Without an open-items table or Blocks Delivery Start flag there is nothing to check.
+    no_items = 'no artifacts' if not audit.docs else None if items else 'no open items or statuses recognised'
+
+    check = 'No open item blocks delivery start'
+    blocking = [item for item in open_items if item['blocks']]
+    if no_items:
+        audit.skip(group, check, [], no_items)
+    elif blocking:
+        for item in blocking:
+            label = f'{item["id"]}: {item["item"]}' if item['id'] else item['item']
+            audit.record(group, check, [item['step']], 'FAIL', f'Open and marked Blocks Delivery Start — {label}.',
+                         f'Resolve before delivery starts{" (owner: " + item["owner"] + ")" if item["owner"] else ""}.',
+                         True)
+    else:
+        audit.record(group, check, [], 'PASS')
+
+    check = 'Items raised in Phase 1 are resolved in a later step'
+    first_raised = {}
+    for item in items:
+        first_raised.setdefault(item_key(item), item['step'])
+    stale = [item for item in open_items if first_raised[item_key(item)].startswith('P1.')]
+    if no_items:
+        audit.skip(group, check, [], no_items)
+    elif stale:
+        steps = sorted({first_raised[item_key(item)] for item in stale})
+        audit.record(group, check, steps, 'WARNING',
+                     f'{len(stale)} Phase 1 item(s) still open: '
+                     f'{listed([item["id"] or item["item"] for item in stale], 4)}.',
+                     'Close each item or carry it into the Issue Log with an owner.')
+    else:
+        audit.record(group, check, [], 'PASS')
+
+
+def run_audit(artifacts_dir, data_dir=DATA_DIR):
+    """Index every artifact and run all checks; returns the report dict."""
+    started = time.perf_counter()
+    workflow = render_prompts.load_workflow(data_dir)
+    steps = render_prompts.workflow_steps(workflow)
+    paths = find_artifacts(workflow, artifacts_dir)
+    docs, unreadable = {}, {}
+    for step in steps:
+        step_id = step['prompt_id']
+        if step_id in paths:
+            try:
+                docs[step_id] = index_artifact(step, paths[step_id])
+            except UnicodeDecodeError as exc:
+                unreadable[step_id] = f'not UTF-8 text ({exc.reason} at byte {exc.start})'
+    audit = Audit(docs, unreadable)
+    check_scope(audit)
+    check_dates(audit)
+    check_resources(audit)
+    check_governance(audit)
+    check_open_items(audit, [step['prompt_id'] for step in steps])
+    counts = {status: sum(1 for check in audit.checks if check['status'] == status)
+              for status in ('PASS', 'FAIL', 'WARNING', 'NOT CHECKED')}
+    return {
+        'artifacts': {step_id: str(path) for step_id, path in paths.items()},
+        'missing_artifacts': [step['prompt_id'] for step in steps if step['prompt_id'] not in paths],
+        'unreadable_artifacts': unreadable,
+        'checks': audit.checks,
+        'open_items': audit.open_items,
+        'counts': counts,
+        'ok': counts['FAIL'] == 0,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+# ── Output ───────────────────────────────────────────────────────────────────
+
+def md_cell(text):
+    return str(text).replace('|', '\\|').replace('\n', ' ')
+
+
+def markdown(report):
+    """The audit as a section to paste after the PMO Playbook prompt."""
+    counts = report['counts']
+    indexed = len(report['artifacts']) - len(report['unreadable_artifacts'])
+    lines = [
+        'CROSS-DOCUMENT CONSISTENCY AUDIT — RESULTS',
+        '',
+        'These checks were run locally (scripts/consistency_audit.py) over the artifacts of '
+        f'{indexed} workflow steps. Use these findings for the Consistency Audit section '
+        'and the Master Open Items sheet instead of re-running the checks.',
+        '',
+        f'{counts["FAIL"]} FAIL, {counts["WARNING"]} WARNING, {counts["PASS"]} PASS, '
+        f'{counts["NOT CHECKED"]} not checked.',
+        '',
+    ]
+    if report['unreadable_artifacts']:
+        lines += ['Unreadable artifacts: ' + '; '.join(
+            f'{step_id}: {reason}' for step_id, reason in report['unreadable_artifacts'].items()) + '.', '']
+    if counts['FAIL'] > BANNER_FAILS:
+        lines += [f'"{BANNER}"', '']
+    findings = [check for check in report['checks'] if check['status'] in ('FAIL', 'WARNING')]
+    lines += ['| Result | Document(s) | Inconsistency Found | Recommended Resolution | Blocks Delivery Start (Y/N) |',
+              '|---|---|---|---|---|']
+    lines += [f'| {check["status"]} | {md_cell(", ".join(check["documents"]))} | {md_cell(check["finding"])} | '
+              f'{md_cell(check["resolution"])} | {"Y" if check["blocks_delivery_start"] else "N"} |'
+              for check in findings]
+    if not findings and counts['NOT CHECKED']:
+        lines.append(f'| — | — | No inconsistencies found by the checks that ran; {counts["NOT CHECKED"]} of '
+                     f'{len(report["checks"])} checks were not run (see below). | — | N |')
+    elif not findings:
+        lines.append('| PASS | — | No inconsistencies found. | — | N |')
+    lines += ['', 'Checks:']
+    lines += [f'- {check["status"]}: {check["group"]} — {check["check"]}'
+              + (f' ({check["finding"]})' if check['status'] == 'NOT CHECKED' else '')
+              for check in report['checks']]
+    lines += ['', 'Master Open Items:', '',
+              '| ID | Raised In | Item | Owner | Blocks Delivery Start (Y/N) |', '|---|---|---|---|---|']
+    lines += [f'| {md_cell(item["id"] or "—")} | {item["step"]} | {md_cell(item["item"])} | '
+              f'{md_cell(item["owner"] or "—")} | {"Y" if item["blocks"] else "N"} |'
+              for item in report['open_items']] or ['| — | — | No open items found. | — | N |']
+    return '\n'.join(lines) + '\n'
+
+
+def print_report(report):
+    print(f'Artifacts: {len(report["artifacts"])} of {len(report["artifacts"]) + len(report["missing_artifacts"])} '
+          f'steps' + (f' (missing: {", ".join(report["missing_artifacts"])})' if report['missing_artifacts'] else ''))
+    for step_id, reason in report['unreadable_artifacts'].items():
+        print(f'WARNING: {step_id} artifact is unreadable: {reason}')
+    group = None
+    for check in report['checks']:
+        if check['group'] != group:
+            group = check['group']
+            print(f'\n{group}')
+        print(f'  {check["status"]:<11} {check["check"]}')
+        if check['finding']:
+            print(f'              {check["finding"]}')
+    counts = report['counts']
+    print(f'\nDone in {report["elapsed_ms"]:.0f} ms. {counts["FAIL"]} FAIL, {counts["WARNING"]} WARNING, '
+          f'{counts["PASS"]} PASS, {counts["NOT CHECKED"]} not checked; {len(report["open_items"])} open item(s).')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cross-check the artifacts of the workflow steps.')
+    parser.add_argument('artifacts', type=Path, help='directory of step artifacts named <STEP>.<ext>')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR, help=f'default: {DATA_DIR}')
+    parser.add_argument('--markdown', type=Path, metavar='FILE',
+                        help='write the findings section for the PMO Playbook prompt to FILE')
+    parser.add_argument('--report', type=Path, metavar='FILE',
+                        help='write the JSON report to FILE ("-" for stdout)')
+    args = parser.parse_args()
+
+    if not args.artifacts.is_dir():
+        print(f'ERROR: artifacts directory not found: {args.artifacts}')
+        sys.exit(1)
+
+    report = run_audit(args.artifacts, args.data_dir)
+
+    if args.markdown:
+        args.markdown.write_text(markdown(report), encoding='utf-8')
+    if args.report and str(args.report) == '-':
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+    else:
+        print_report(report)
+        if args.markdown:
+            print(f'Findings written to {args.markdown}')
+        if args.report:
+            with args.report.open('w', encoding='utf-8') as fh:
+                json.dump(report, fh, indent=2, ensure_ascii=False)
+            print(f'Report written to {args.report}')
+
+    if not report['ok']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for per-client and per-methodology prompt packs.
+
+A pack is a complete prompts/ directory: the shared prompt set plus a client's
+forks, such as an Agile schedule_milestones.json or a fixed-fee
+budget_cost_baseline.json. Storing every fork as a full copy repeats the
+unchanged prompts in every pack, so the store keeps chunks instead:
+  - each prompt file is cut where its instruction starts, after the shared
+    ENGAGEMENT CONTEXT block, before every `STEP n —` section and where the
+    instruction ends;
+  - each chunk is saved once under chunks/<aa>/<sha256>, however many files
+    and packs contain it;
+  - packs/<name>.json lists, for every file, its SHA-256 and chunk hashes.
+
+Chunks are byte ranges of the file as written, so joining a file's chunks
+reproduces it exactly. A fork that changes one STEP adds one chunk to the
+store.
+
+The default store (packs/) and the state file materialise leaves in
+prompts/ are gitignored: packs are local working state, and a store meant
+to be shared lives elsewhere (--store).
+
+Commands:
+  add NAME        store a prompts directory as pack NAME (replaces NAME)
+  materialise N   write pack N into a prompts directory; files that already
+                  match are not rewritten, so switching packs only writes the
+                  files that differ
+  diff A B        list the files and STEP sections that differ between two
+                  packs (--text shows the changed lines); files with equal
+                  hashes are skipped and only differing chunks are read
+  remove NAME     delete a pack manifest
+  gc              delete chunks no pack refers to (--dry-run to preview)
+  list            packs with their size, and the space the store saves
+
+Usage:
+  python scripts/pack_store.py add acme-agile --from clients/acme/prompts
+  python scripts/pack_store.py materialise acme-agile
+  python scripts/pack_store.py diff base acme-agile --text
+  python scripts/pack_store.py remove acme-agile
+  python scripts/pack_store.py gc
+  python scripts/pack_store.py list --report packs.json
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import tempfile
+import time
+
+from update_prompts import CONTEXT_BLOCK
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PROMPTS_DIR = REPO_ROOT / 'prompts'
+STORE_DIR = REPO_ROOT / 'packs'
+
+STORE_FORMAT = 'delivery-launcher-pack-store/1'
+
+# Written into a materialised directory to record which pack it holds, with
+# the stat of each file, so the next switch can skip unchanged files unread.
+# No .json suffix, so tools that glob prompts/*.json do not pick it up.
+STATE_FILE = '.pack-state'
+
+INSTRUCTION_KEY = '"instruction": "'
+JSON_STRING_BODY = re.compile(r'(?:[^"\\]|\\.)*', re.S)
+STEP_MARKER = re.compile(r'STEP \d+ (?:—|\\u2014)')
+# CONTEXT_BLOCK as it appears inside the JSON-encoded instruction string.
+CONTEXT_PREFIX = json.dumps(CONTEXT_BLOCK, ensure_ascii=False)[1:-1]
+
+
+# ── Chunking ─────────────────────────────────────────────────────────────────
+
+def chunk_offsets(text):
+    """Offsets at which a prompt file's text is cut into chunks."""
+    start = text.find(INSTRUCTION_KEY)
+    if start < 0:
+        return []
+    start += len(INSTRUCTION_KEY)
+    end = JSON_STRING_BODY.match(text, start).end()
+    cuts = [start]
+    if text.startswith(CONTEXT_PREFIX, start):
+        cuts.append(start + len(CONTEXT_PREFIX))
+    cuts.extend(m.start() for m in STEP_MARKER.finditer(text, start, end))
+    cuts.append(end)
+    return sorted(set(cut for cut in cuts if 0 < cut < len(text)))
+
+
+def split_chunks(data):
+    """Split the bytes of a prompt file into chunks; joined, they equal data."""
+    text = data.decode('utf-8')
+    bounds = [0] + chunk_offsets(text) + [len(text)]
+    return [text[a:b].encode('utf-8') for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def chunk_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def chunk_label(data):
+    """Short description of a chunk for diff output."""
+    text = data.decode('utf-8')
+    if text.startswith('{'):
+        return '(file header)'
+    if text.startswith(CONTEXT_PREFIX):
+        return 'ENGAGEMENT CONTEXT block'
+    if STEP_MARKER.match(text):
+        line = text.split('\\n', 1)[0]
+        try:
+            return json.loads(f'"{line}"')
+        except ValueError:
+            return line
+    if text.startswith('"'):
+        return '(trailing fields)'
+    return '(introduction)'
+
+
+# ── Store ────────────────────────────────────────────────────────────────────
+
+class Store:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.chunks_dir = self.root / 'chunks'
+        self.packs_dir = self.root / 'packs'
+
+    def chunk_path(self, digest):
+        return self.chunks_dir / digest[:2] / digest
+
+    def read_chunk(self, digest):
+        path = self.chunk_path(digest)
+        if not path.exists():
+            raise ValueError(f'chunk {digest} is missing from {self.chunks_dir}')
+        return path.read_bytes()
+
+    def write_chunk(self, digest, data):
+        """Store a chunk unless present; returns the number of bytes written."""
+        path = self.chunk_path(digest)
+        if path.exists():
+            return 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, data)
+        return len(data)
+
+    def pack_path(self, name):
+        if not name or '/' in name or '\\' in name or name.startswith('.'):
+            raise ValueError(f'invalid pack name: {name!r}')
+        return self.packs_dir / f'{name}.json'
+
+    def pack_names(self):
+        if not self.packs_dir.exists():
+            return []
+        return sorted(path.stem for path in self.packs_dir.glob('*.json'))
+
+    def load_pack(self, name):
+        path = self.pack_path(name)
+        if not path.exists():
+            raise ValueError(f'no pack named {name!r} in {self.root}')
+        with path.open('r', encoding='utf-8') as fh:
+            pack = json.load(fh)
+        if pack.get('format') != STORE_FORMAT:
+            raise ValueError(f'{path}: unknown format {pack.get("format")!r}')
+        return pack
+
+    def save_pack(self, pack):
+        path = self.pack_path(pack['name'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, (json.dumps(pack, indent=2) + '\n').encode('utf-8'))
+
+    def stored_chunks(self):
+        """{digest: size} of every chunk on disk."""
+        if not self.chunks_dir.exists():
+            return {}
+        return {path.name: path.stat().st_size for path in self.chunks_dir.glob('*/*') if path.is_file()}
+
+
+def write_atomic(path, data):
+    fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def prompt_files(directory):
+    return sorted(path for path in Path(directory).glob('*.json')
+                  if path.is_file() and not path.name.startswith('.'))
+
+
+# ── Commands ─────────────────────────────────────────────────────────────────
+
+def add_pack(store, name, source):
+    """Store every prompt file in source as pack `name`."""
+    files = prompt_files(source)
+    if not files:
+        raise ValueError(f'no prompt files in {source}')
+    entries = {}
+    chunks = new_chunks = new_bytes = size = 0
+    for path in files:
+        data = path.read_bytes()
+        parts = split_chunks(data)
+        digests = [chunk_hash(part) for part in parts]
+        for digest, part in zip(digests, parts):
+            written = store.write_chunk(digest, part)
+            new_chunks += bool(written)
+            new_bytes += written
+        entries[path.name] = {'sha256': chunk_hash(data), 'size': len(data), 'chunks': digests}
+        chunks += len(parts)
+        size += len(data)
+    store.save_pack({'format': STORE_FORMAT, 'name': name, 'files': entries})
+    return {'pack': name, 'files': len(entries), 'chunks': chunks, 'bytes': size,
+            'new_chunks': new_chunks, 'new_bytes': new_bytes}
+
+
+def file_stamp(path):
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_state(target):
+    path = target / STATE_FILE
+    if not path.exists():
+        return {}
+    try:
+        with path.open('r', encoding='utf-8') as fh:
+            return json.load(fh).get('files', {})
+    except (ValueError, AttributeError):
+        return {}
+
+
+def materialise_pack(store, name, target):
+    """Write pack `name` into target, touching only files that differ.
+
+    A file is left alone when its size and mtime match the state recorded by
+    the last materialise and the pack wants the same hash, so a switch reads
+    and writes only the files the two packs disagree on. Other files are
+    hashed before being overwritten. Files a previous pack wrote that this
+    pack lacks are removed; files it did not write are left in place.
+    """
+    pack = store.load_pack(name)
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+    state = load_state(target)
+    new_state = {}
+    written = unchanged = removed = 0
+    written_bytes = 0
+
+    for filename, entry in pack['files'].items():
+        path = target / filename
+        known = state.get(filename)
+        if path.exists():
+            stamp = file_stamp(path)
+            if known and known['stamp'] == stamp and known['sha256'] == entry['sha256']:
+                new_state[filename] = known
+                unchanged += 1
+                continue
+            if chunk_hash(path.read_bytes()) == entry['sha256']:
+                new_state[filename] = {'sha256': entry['sha256'], 'stamp': stamp}
+                unchanged += 1
+                continue
+        data = b''.join(store.read_chunk(digest) for digest in entry['chunks'])
+        if chunk_hash(data) != entry['sha256']:
+            raise ValueError(f'{name}/{filename}: chunks do not reproduce the recorded SHA-256')
+        write_atomic(path, data)
+        new_state[filename] = {'sha256': entry['sha256'], 'stamp': file_stamp(path)}
+        written += 1
+        written_bytes += len(data)
+
+    for filename, known in state.items():
+        path = target / filename
+        if filename in pack['files'] or not path.exists():
+            continue
+        if file_stamp(path) == known['stamp']:
+            path.unlink()
+            removed += 1
+
+    write_atomic(target / STATE_FILE,
+                 (json.dumps({'pack': name, 'files': new_state}, indent=2) + '\n').encode('utf-8'))
+    return {'pack': name, 'target': str(target), 'written': written, 'bytes': written_bytes,
+            'unchanged': unchanged, 'removed': removed}
+
+
+def diff_packs(store, name_a, name_b, text=False):
+    """Differences between two packs, reading only the chunks that differ."""
+    files_a = store.load_pack(name_a)['files']
+    files_b = store.load_pack(name_b)['files']
+    changed = []
+    for filename in sorted(set(files_a) & set(files_b)):
+        a, b = files_a[filename], files_b[filename]
+        if a['sha256'] == b['sha256']:
+            continue
+        sections = []
+        matcher = difflib.SequenceMatcher(None, a['chunks'], b['chunks'], autojunk=False)
+        for op, a1, a2, b1, b2 in matcher.get_opcodes():
+            if op == 'equal':
+                continue
+            old = [store.read_chunk(digest) for digest in a['chunks'][a1:a2]]
+            new = [store.read_chunk(digest) for digest in b['chunks'][b1:b2]]
+            section = {'change': op, 'labels': [chunk_label(part) for part in (new or old)]}
+            if text:
+                section['diff'] = list(difflib.unified_diff(
+                    decode_lines(old), decode_lines(new),
+                    f'{name_a}/{filename}', f'{name_b}/{filename}', lineterm=''))
+            sections.append(section)
+        changed.append({'file': filename, 'sections': sections})
+    return {
+        'packs': [name_a, name_b],
+        'only_in_a': sorted(set(files_a) - set(files_b)),
+        'only_in_b': sorted(set(files_b) - set(files_a)),
+        'changed': changed,
+        'identical': sum(1 for f in set(files_a) & set(files_b) if files_a[f]['sha256'] == files_b[f]['sha256']),
+    }
+
+
+def decode_lines(parts):
+    """Instruction text of raw chunks, split into lines for difflib."""
+    raw = b''.join(parts).decode('utf-8')
+    try:
+        return json.loads(f'"{raw}"').splitlines()
+    except ValueError:
+        return raw.splitlines()
+
+
+def gc_store(store, dry_run=False):
+    """Delete chunks that no pack manifest refers to."""
+    referenced = set()
+    for name in store.pack_names():
+        for entry in store.load_pack(name)['files'].values():
+            referenced.update(entry['chunks'])
+    stored = store.stored_chunks()
+    garbage = {digest: size for digest, size in stored.items() if digest not in referenced}
+    if not dry_run:
+        for digest in garbage:
+            path = store.chunk_path(digest)
+            path.unlink()
+            if not any(path.parent.iterdir()):
+                path.parent.rmdir()
+    return {'removed': len(garbage), 'bytes': sum(garbage.values()), 'kept': len(stored) - len(garbage),
+            'dry_run': dry_run}
+
+
+def list_store(store):
+    """Every pack with its size, and what the store occupies."""
+    packs = []
+    logical = 0
+    for name in store.pack_names():
+        files = store.load_pack(name)['files']
+        size = sum(entry['size'] for entry in files.values())
+        packs.append({'pack': name, 'files': len(files), 'bytes': size,
+                      'chunks': sum(len(entry['chunks']) for entry in files.values())})
+        logical += size
+    stored = store.stored_chunks()
+    return {'store': str(store.root), 'packs': packs, 'logical_bytes': logical,
+            'stored_chunks': len(stored), 'stored_bytes': sum(stored.values())}
+
+
+# ── Output ───────────────────────────────────────────────────────────────────
+
+def print_result(command, result):
+    if command == 'add':
+        print(f'Pack {result["pack"]}: {result["files"]} files, {result["chunks"]} chunks, '
+              f'{result["bytes"]:,} bytes; {result["new_chunks"]} new chunk(s) stored '
+              f'({result["new_bytes"]:,} bytes).')
+    elif command == 'materialise':
+        print(f'Pack {result["pack"]} -> {result["target"]}: {result["written"]} file(s) written '
+              f'({result["bytes"]:,} bytes), {result["unchanged"]} unchanged, {result["removed"]} removed.')
+    elif command == 'diff':
+        name_a, name_b = result['packs']
+        for filename in result['only_in_a']:
+            print(f'  only in {name_a}: {filename}')
+        for filename in result['only_in_b']:
+            print(f'  only in {name_b}: {filename}')
+        for entry in result['changed']:
+            print(f'  {entry["file"]}')
+            for section in entry['sections']:
+                for label in section['labels']:
+                    print(f'    {section["change"]:<8} {label}')
+                for line in section.get('diff', []):
+                    print(f'      {line}')
+        print(f'{len(result["changed"])} file(s) differ, {result["identical"]} identical, '
+              f'{len(result["only_in_a"]) + len(result["only_in_b"])} in one pack only.')
+    elif command == 'remove':
+        print(f'Pack {result["pack"]} removed. Run gc to delete chunks no other pack uses.')
+    elif command == 'gc':
+        verb = 'would remove' if result['dry_run'] else 'removed'
+        print(f'gc {verb} {result["removed"]} chunk(s) ({result["bytes"]:,} bytes); {result["kept"]} kept.')
+    elif command == 'list':
+        print(f'Store: {result["store"]}')
+        print(f'  {"Pack":<28}{"Files":>7}{"Chunks":>8}{"Bytes":>12}')
+        for pack in result['packs']:
+            print(f'  {pack["pack"]:<28}{pack["files"]:>7}{pack["chunks"]:>8}{pack["bytes"]:>12,}')
+        saved = result['logical_bytes'] - result['stored_bytes']
+        print(f'{len(result["packs"])} pack(s), {result["logical_bytes"]:,} bytes as files; '
+              f'stored as {result["stored_chunks"]} chunks in {result["stored_bytes"]:,} bytes '
+              f'({saved:,} saved).')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Content-addressed store for prompt packs.')
+    parser.add_argument('--store', type=Path, default=STORE_DIR, help=f'store directory (default: {STORE_DIR})')
+    parser.add_argument('--report', type=Path, metavar='FILE',
+                        help='write the JSON result to FILE ("-" for stdout)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help='store a prompts directory as a pack')
+    add.add_argument('name')
+    add.add_argument('--from', dest='source', type=Path, default=PROMPTS_DIR,
+                     help=f'prompts directory to store (default: {PROMPTS_DIR})')
+
+    materialise = commands.add_parser('materialise', help='write a pack into a prompts directory')
+    materialise.add_argument('name')
+    materialise.add_argument('--to', dest='target', type=Path, default=PROMPTS_DIR,
+                             help=f'directory to write (default: {PROMPTS_DIR})')
+
+    diff = commands.add_parser('diff', help='compare two packs')
+    diff.add_argument('a')
+    diff.add_argument('b')
+    diff.add_argument('--text', action='store_true', help='show the changed instruction lines')
+
+    remove = commands.add_parser('remove', help='delete a pack manifest')
+    remove.add_argument('name')
+
+    gc = commands.add_parser('gc', help='delete chunks no pack refers to')
+    gc.add_argument('--dry-run', action='store_true', help='report without deleting')
+
+    commands.add_parser('list', help='list packs and store usage')
+    args = parser.parse_args()
+
+    store = Store(args.store)
+    started = time.perf_counter()
+    try:
+        if args.command == 'add':
+            if not args.source.is_dir():
+                raise ValueError(f'prompts directory not found: {args.source}')
+            result = add_pack(store, args.name, args.source)
+        elif args.command == 'materialise':
+            result = materialise_pack(store, args.name, args.target)
+        elif args.command == 'diff':
+            result = diff_packs(store, args.a, args.b, args.text)
+        elif args.command == 'remove':
+            store.load_pack(args.name)
+            store.pack_path(args.name).unlink()
+            result = {'pack': args.name}
+        elif args.command == 'gc':
+            result = gc_store(store, args.dry_run)
+        else:
+            result = list_store(store)
+    except ValueError as exc:
+        print(f'ERROR: {exc}')
+        sys.exit(1)
+    result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    if args.report and str(args.report) == '-':
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print_result(args.command, result)
+        if args.report:
+            with args.report.open('w', encoding='utf-8') as fh:
+                json.dump(result, fh, indent=2)
+            print(f'Report written to {args.report}')
+
+
+if __name__ == '__main__':
+    main()
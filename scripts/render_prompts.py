@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+"""
+Render every workflow step's prompt for one or more engagement briefs, without
+the browser.
+
+A brief is the JSON object the page builds with compileForm() (the same shape
+P1.1 receives as {{ENGAGEMENT_DATA}}). For each brief, every step in
+data/workflow.json is rendered with the same rules as buildPromptText /
+buildPromptContext in index.html:
+  - an instruction containing {{ENGAGEMENT_DATA}} gets the full brief,
+    pretty-printed with two-space indentation;
+  - any other instruction gets the compact ENGAGEMENT CONTEXT SNAPSHOT appended,
+    limited to the step's `context_fields` in data/workflow.json when it has them;
+  - the placeholders of the ENGAGEMENT CONTEXT block at the start of an
+    instruction ([CLIENT_NAME], [WATERFALL / AGILE / HYBRID], ...) are filled
+    from the brief. Placeholders the brief has no value for are left in place
+    and listed after the brief's RENDERED line.
+
+With --artifacts DIR, the artifact each step produced is read from
+DIR/<STEP>.<ext> (for example P1.1.md; .md, .txt and .csv are preferred over
+other files for the same step) and every prompt is followed by the
+digests of the steps it transitively depends on, as the page does with
+artifacts pasted onto its cards.
+
+Output is one directory per brief holding prompt-<STEP>.txt files, named as
+the page's Export button names them. With --bundle, each brief is written as
+<brief>.zip instead, byte for byte what the page's Export Pack button writes
+for the same steps: the prompts, then manifest.json. --completed lists the
+steps already complete (which decides each step's status and, with
+--scope unlocked, which steps are included).
+
+Usage:
+  python scripts/render_prompts.py brief.json --out rendered/
+  python scripts/render_prompts.py briefs/*.json --out rendered/ --jobs 8
+  python scripts/render_prompts.py brief.json --out rendered/ --artifacts outputs/
+  python scripts/render_prompts.py brief.json --out packs/ --bundle --scope unlocked --completed P1.1,P1.2
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+from pathlib import Path
+import re
+import struct
+import sys
+import time
+import zlib
+
+import build_html
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / 'data'
+PROMPTS_DIR = REPO_ROOT / 'prompts'
+
+ENGAGEMENT_DATA = '{{ENGAGEMENT_DATA}}'
+
+
+# ── Loading ──────────────────────────────────────────────────────────────────
+
+def load_workflow(data_dir=DATA_DIR):
+    with (Path(data_dir) / 'workflow.json').open('r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def workflow_steps(workflow):
+    """Every step in workflow order."""
+    return [prompt for phase in workflow['phases'] for prompt in phase['prompts']]
+
+
+def load_prompts(workflow, prompts_dir=PROMPTS_DIR):
+    """Return {file: prompt JSON} for every step whose prompt file exists."""
+    prompts = {}
+    for step in workflow_steps(workflow):
+        path = Path(prompts_dir) / step['file']
+        if path.exists():
+            with path.open('r', encoding='utf-8') as fh:
+                prompts[step['file']] = json.load(fh)
+    return prompts
+
+
+# ── JavaScript-compatible helpers ────────────────────────────────────────────
+
+def js_stringify(value):
+    """JSON.stringify(value, null, 2) for the JSON types a brief contains."""
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def js_replace_first(text, pattern, replacement):
+    """String.prototype.replace(pattern, replacement) with a string pattern,
+    including the $$, $&, $` and $' replacement patterns."""
+    idx = text.find(pattern)
+    if idx < 0:
+        return text
+    if '$' in replacement:
+        specials = {'$': '$', '&': pattern, '`': text[:idx], "'": text[idx + len(pattern):]}
+        out, i = [], 0
+        while i < len(replacement):
+            ch = replacement[i]
+            if ch == '$' and i + 1 < len(replacement) and replacement[i + 1] in specials:
+                out.append(specials[replacement[i + 1]])
+                i += 2
+            else:
+                out.append(ch)
+                i += 1
+        replacement = ''.join(out)
+    return text[:idx] + replacement + text[idx + len(pattern):]
+
+
+def _js_or(value, default):
+    """`value || default` for values that are absent, null or an empty string."""
+    return default if value is None or value == '' or value is False or value == 0 else value
+
+
+_MISSING = object()
+
+
+def _defined(**fields):
+    """Object literal whose undefined members JSON.stringify would drop."""
+    return {key: value for key, value in fields.items() if value is not _MISSING}
+
+
+# ── Prompt rendering (mirrors buildPromptContext / buildPromptText) ──────────
+
+# Snapshot field -> builder, in snapshot order (PROMPT_CONTEXT_FIELDS in index.html).
+CONTEXT_FIELDS = {
+    'engagement_context': lambda data: _js_or(data.get('engagement_context'), {}),
+    'industry': lambda data: _js_or(data.get('industry'), {}),
+    'objectives': lambda data: _js_or(data.get('objectives'), [])[:3],
+    'service_offerings': lambda data: [
+        _defined(
+            domain=domain.get('domain', _MISSING),
+            selected_building_blocks=[
+                block.get('building_block') if isinstance(block, dict) else None
+                for block in _js_or(domain.get('selected_building_blocks'), [])[:5]
+            ],
+        )
+        for domain in _js_or(data.get('service_offerings'), [])[:5]
+    ],
+    'key_risks': lambda data: [
+        _defined(
+            industry_group=risk.get('industry_group', _MISSING),
+            risk_type=risk.get('risk_type', _MISSING),
+        )
+        for risk in _js_or(data.get('risk_profile'), [])[:3]
+    ],
+    'key_regulations': lambda data: _js_or(data.get('regulatory_profile'), [])[:5],
+}
+
+
+def context_fields(prompt):
+    """The snapshot fields a step receives: its context_fields, or all of them."""
+    fields = prompt.get('context_fields')
+    return [field for field in CONTEXT_FIELDS if fields is None or field in fields]
+
+
+def build_prompt_context(data, fields=None):
+    fields = list(CONTEXT_FIELDS) if fields is None else fields
+    return js_stringify({field: CONTEXT_FIELDS[field](data) for field in CONTEXT_FIELDS if field in fields})
+
+
+def _context_value(key):
+    return lambda data: _js_or(data.get('engagement_context'), {}).get(key)
+
+
+def _joined(values, separator):
+    """`values.filter(Boolean).join(separator)`."""
+    return separator.join(value for value in values if value)
+
+
+# Slot ID -> value builder (PROMPT_SLOTS in index.html); the labels and the
+# placeholders they fill are in build_html.PROMPT_SLOTS.
+SLOT_VALUES = {
+    'client_name': _context_value('client_name'),
+    'engagement_name': _context_value('engagement_name'),
+    'engagement_code': _context_value('engagement_code'),
+    'engagement_manager': _context_value('engagement_manager'),
+    'partner_in_charge': _context_value('partner_in_charge'),
+    'industry': lambda data: _joined(
+        (_js_or(data.get('industry'), {}).get(key) for key in ('industry', 'sector', 'sub_sector')), ' / '),
+    'service_line': lambda data: _joined(
+        (domain.get('domain') for domain in _js_or(data.get('service_offerings'), [])), ', '),
+    'delivery_methodology': _context_value('delivery_methodology'),
+    'fee_structure': _context_value('fee_structure'),
+    'start_date': _context_value('start_date'),
+    'end_date': _context_value('end_date'),
+    'total_budget': _context_value('total_budget'),
+    'primary_workstreams': _context_value('primary_workstreams'),
+    'key_stakeholders': _context_value('key_stakeholders'),
+    'engagement_complexity': _context_value('engagement_complexity'),
+    'regulatory_requirements': lambda data: _joined(dict.fromkeys(
+        profile.get('regulator') for profile in _js_or(data.get('regulatory_profile'), [])), ', '),
+}
+SLOT_LABELS = {slot: label for label, slot in build_html.PROMPT_SLOTS.items()}
+
+_template_cache = {}
+
+
+def prompt_template(instruction):
+    """(literal segments, [(slot, placeholder)]) for an instruction's
+    ENGAGEMENT CONTEXT slots; the literals are one longer than the slots."""
+    if instruction not in _template_cache:
+        literals, slots, at = [], [], 0
+        for start, end, slot in build_html.prompt_slots(instruction):
+            literals.append(instruction[at:start])
+            slots.append((slot, instruction[start:end]))
+            at = end
+        literals.append(instruction[at:])
+        _template_cache[instruction] = (literals, slots)
+    return _template_cache[instruction]
+
+
+def slot_value(slot, data):
+    """The brief's value for a slot, or '' when it has none."""
+    value = SLOT_VALUES[slot](data) if slot in SLOT_VALUES else None
+    return value if isinstance(value, str) else ''
+
+
+def fill_slots(instruction, data):
+    """Return (instruction with its slots filled, IDs of the slots left unfilled)."""
+    literals, slots = prompt_template(instruction)
+    if not slots:
+        return instruction, []
+    pieces, unfilled = [literals[0]], []
+    for (slot, placeholder), literal in zip(slots, literals[1:]):
+        value = slot_value(slot, data)
+        if not value:
+            unfilled.append(slot)
+        pieces.append(value or placeholder)
+        pieces.append(literal)
+    return ''.join(pieces), unfilled
+
+
+def build_prompt_text(prompt, prompt_json, data):
+    raw = prompt_json.get('instruction') or '[Instruction not found in prompt file]'
+    instruction, _ = fill_slots(raw, data)
+    if ENGAGEMENT_DATA in raw:
+        return js_replace_first(instruction, ENGAGEMENT_DATA, js_stringify(data))
+
+    compact_context = build_prompt_context(data, context_fields(prompt))
+    return f'{instruction}\n\n---\n\nENGAGEMENT CONTEXT SNAPSHOT\n{compact_context}'
+
+
+# ── Artifact digests (mirrors digestArtifact / formatDigest / withUpstreamDigests) ──
+
+DIGEST_LIMITS = {'headings': 40, 'tables': 6, 'table_rows': 5, 'decisions': 15, 'words': 40}
+# re.ASCII keeps \b and case folding to what the page's regular expressions do.
+DIGEST_DECISION = re.compile(r'\b(decision|decisions|decided|agreed|approved|resolved)\b', re.I | re.A)
+_LINE_BREAK = re.compile(r'\r\n|\r|\n')
+_TABLE_SEPARATOR = re.compile(r'[|:\- \t]+')
+_HEADING = re.compile(r'(#{1,6})[ \t]+([\s\S]+)')
+_HEADING_TAIL = re.compile(r'[ \t#]+\Z')
+_LIST_MARKER = re.compile(r'^([-*+]|[0-9]+[.)])[ \t]+')
+
+UPSTREAM_NOTE = ('Digests of the artifacts produced by the steps this one builds on. '
+                 'Treat them as the agreed outputs of those steps.')
+
+
+def _clip_words(text):
+    words = text.split(' ')
+    if len(words) > DIGEST_LIMITS['words']:
+        return ' '.join(words[:DIGEST_LIMITS['words']]) + ' …'
+    return text
+
+
+def digest_artifact(text):
+    """Headings, the first rows of each table and the decision lines of an artifact."""
+    digest = {'headings': [], 'tables': [], 'decisions': []}
+    heading = ''
+    table = None
+    for raw in _LINE_BREAK.split(text):
+        line = raw.strip(' \t')
+        if line.startswith('|'):
+            if table is None:
+                table = {'heading': heading, 'rows': [], 'more': 0}
+                if len(digest['tables']) < DIGEST_LIMITS['tables']:
+                    digest['tables'].append(table)
+            if _TABLE_SEPARATOR.fullmatch(line):
+                continue
+            if len(table['rows']) <= DIGEST_LIMITS['table_rows']:
+                table['rows'].append(_clip_words(line))
+            else:
+                table['more'] += 1
+            continue
+        table = None
+        match = _HEADING.fullmatch(line)
+        if match:
+            heading = _clip_words(_HEADING_TAIL.sub('', match.group(2)))
+            if len(digest['headings']) < DIGEST_LIMITS['headings']:
+                digest['headings'].append([len(match.group(1)), heading])
+        elif line and DIGEST_DECISION.search(line) and len(digest['decisions']) < DIGEST_LIMITS['decisions']:
+            digest['decisions'].append(_clip_words(_LIST_MARKER.sub('', line, count=1)))
+    return digest
+
+
+def format_digest(step, digest):
+    lines = [f'[{step["prompt_id"]}] {step["artifact"]}']
+    if digest['headings']:
+        top = min(level for level, _ in digest['headings'])
+        lines.append('Headings:')
+        lines.extend(f'{"  " * (level - top)}- {title}' for level, title in digest['headings'])
+    if digest['tables']:
+        lines.append('Key tables:')
+        for table in digest['tables']:
+            if table['heading']:
+                lines.append(f'Under "{table["heading"]}":')
+            lines.extend(table['rows'])
+            if table['more']:
+                lines.append(f'… {table["more"]} more row{"" if table["more"] == 1 else "s"}')
+    if digest['decisions']:
+        lines.append('Decisions:')
+        lines.extend(f'- {decision}' for decision in digest['decisions'])
+    if len(lines) == 1:
+        lines.append('(No headings, tables or decisions found.)')
+    return '\n'.join(lines)
+
+
+def with_upstream_digests(text, upstream):
+    if not upstream:
+        return text
+    blocks = '\n\n'.join(format_digest(step, digest) for step, digest in upstream)
+    return f'{text}\n\n---\n\nUPSTREAM ARTIFACT DIGESTS\n{UPSTREAM_NOTE}\n\n{blocks}'
+
+
+def upstream_steps(workflow, step_id):
+    """Every step step_id transitively depends on, in workflow order."""
+    steps = workflow_steps(workflow)
+    by_id = {step['prompt_id']: step for step in steps}
+    seen = set()
+    pending = [step_id]
+    while pending:
+        for dep in by_id.get(pending.pop(), {}).get('depends_on') or []:
+            if dep not in seen:
+                seen.add(dep)
+                pending.append(dep)
+    return [step for step in steps if step['prompt_id'] in seen]
+
+
+_digest_cache = {}
+
+# Artifact extensions read first when a step has several files, as when
+# P1.1.md is saved beside the P1.1.docx it was copied from.
+ARTIFACT_SUFFIXES = ('.md', '.txt', '.csv')
+
+
+def find_artifact(artifacts_dir, step_id):
+    """The artifact file for step_id in artifacts_dir, text formats first; None if there is none."""
+    def preference(path):
+        suffix = path.suffix.lower()
+        rank = ARTIFACT_SUFFIXES.index(suffix) if suffix in ARTIFACT_SUFFIXES else len(ARTIFACT_SUFFIXES)
+        return rank, path.name
+
+    return min(Path(artifacts_dir).glob(f'{step_id}.*'), key=preference, default=None)
+
+
+def load_artifacts(workflow, artifacts_dir):
+    """Return {step id: digest} for every step with an artifact in artifacts_dir.
+
+    Digests are cached by the SHA-256 of the artifact text, so artifacts shared
+    between steps or reloaded by another worker task are digested once.
+    """
+    digests = {}
+    for step in workflow_steps(workflow):
+        path = find_artifact(artifacts_dir, step['prompt_id'])
+        if path is None:
+            continue
+        # utf-8-sig drops a byte-order mark as the browser's File.text() does.
+        text = path.read_text(encoding='utf-8-sig')
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        if key not in _digest_cache:
+            _digest_cache[key] = digest_artifact(text)
+        digests[step['prompt_id']] = _digest_cache[key]
+    return digests
+
+
+def upstream_digests(workflow, step_id, digests):
+    return [(dep, digests[dep['prompt_id']]) for dep in upstream_steps(workflow, step_id)
+            if dep['prompt_id'] in digests]
+
+
+def render_step(step, brief, workflow, prompts, digests):
+    prompt_json = prompts.get(step['file'])
+    if prompt_json is None:
+        return f'[Prompt not found: {step["file"]}]'
+    upstream = upstream_digests(workflow, step['prompt_id'], digests)
+    return with_upstream_digests(build_prompt_text(step, prompt_json, brief), upstream)
+
+
+def unfilled_slots(brief, workflow, prompts):
+    """Labels of the ENGAGEMENT CONTEXT slots the brief leaves unfilled in any prompt."""
+    unfilled = set()
+    for step in workflow_steps(workflow):
+        prompt_json = prompts.get(step['file'])
+        if prompt_json is not None:
+            unfilled.update(fill_slots(prompt_json.get('instruction') or '', brief)[1])
+    return [label for label, slot in build_html.PROMPT_SLOTS.items() if slot in unfilled]
+
+
+def render_brief(brief, workflow, prompts, digests=None):
+    """Return [(prompt_id, text)] for every step, in workflow order."""
+    digests = digests or {}
+    return [(step['prompt_id'], render_step(step, brief, workflow, prompts, digests))
+            for step in workflow_steps(workflow)]
+
+
+# ── Bundles (mirrors exportBundle in index.html) ─────────────────────────────
+
+BUNDLE_FORMAT = 'delivery-launcher-bundle/1'
+# Every entry is dated 1980-01-01 so the same pack always zips to the same bytes.
+ZIP_DOS_DATE = 0x0021
+_ZIP_LOCAL = struct.Struct('<IHHHHHIIIHH')
+_ZIP_CENTRAL = struct.Struct('<IHHHHHHIIIHHHHHII')
+_ZIP_END = struct.Struct('<IHHHHIIH')
+
+
+def bundle_steps(workflow, scope, completed):
+    """[(phase, step, status)] as the page's bundleSteps() builds them."""
+    steps = []
+    for phase in workflow['phases']:
+        for idx, step in enumerate(phase['prompts']):
+            deps = step.get('depends_on')
+            ready = (phase['phase_id'] == 'P1' and idx == 0) or bool(deps and all(dep in completed for dep in deps))
+            status = 'complete' if step['prompt_id'] in completed else 'ready' if ready else 'locked'
+            if scope == 'all' or status != 'locked':
+                steps.append((phase, step, status))
+    return steps
+
+
+def bundle_manifest(brief, workflow, steps, scope, written, digests):
+    context = _js_or(brief.get('engagement_context'), {})
+    entries = []
+    for phase, step, status in steps:
+        name = f'prompt-{step["prompt_id"]}.txt'
+        crc, size = written[name]
+        entries.append({
+            'prompt_id': step['prompt_id'],
+            'prompt_name': step['prompt_name'],
+            'phase': phase['phase_name'],
+            'artifact': step['artifact'],
+            'file': name,
+            'depends_on': step.get('depends_on') or [],
+            'sign_off_gate': bool(step.get('sign_off_gate')),
+            'status': status,
+            'upstream_digests': [dep['prompt_id'] for dep, _ in upstream_digests(workflow, step['prompt_id'], digests)],
+            'bytes': size,
+            'crc32': f'{crc:08x}',
+        })
+    return js_stringify({
+        'format': BUNDLE_FORMAT,
+        'client_name': _js_or(context.get('client_name'), ''),
+        'engagement_name': _js_or(context.get('engagement_name'), ''),
+        'scope': scope,
+        'steps': entries,
+    })
+
+
+def write_bundle(path, brief, workflow, prompts, digests=None, scope='all', completed=()):
+    """Write a brief's prompt pack as a stored ZIP, one entry at a time.
+
+    Returns the number of prompts written.
+    """
+    digests = digests or {}
+    steps = bundle_steps(workflow, scope, set(completed))
+    written = {}
+    central = []
+    with Path(path).open('wb') as fh:
+        def add(name, text):
+            data = text.encode('utf-8')
+            raw_name = name.encode('utf-8')
+            crc = zlib.crc32(data)
+            central.append(_ZIP_CENTRAL.pack(0x02014b50, 20, 20, 0x0800, 0, 0, ZIP_DOS_DATE, crc, len(data),
+                                             len(data), len(raw_name), 0, 0, 0, 0, 0, fh.tell()) + raw_name)
+            fh.write(_ZIP_LOCAL.pack(0x04034b50, 20, 0x0800, 0, 0, ZIP_DOS_DATE, crc, len(data), len(data),
+                                     len(raw_name), 0) + raw_name)
+            fh.write(data)
+            written[name] = (crc, len(data))
+
+        for _, step, _ in steps:
+            add(f'prompt-{step["prompt_id"]}.txt', render_step(step, brief, workflow, prompts, digests))
+        add('manifest.json', bundle_manifest(brief, workflow, steps, scope, written, digests))
+        offset = fh.tell()
+        fh.write(b''.join(central))
+        fh.write(_ZIP_END.pack(0x06054b50, 0, 0, len(central), len(central), fh.tell() - offset, offset, 0))
+    return len(steps)
+
+
+# ── Batch rendering ──────────────────────────────────────────────────────────
+
+_worker_state = {}
+
+
+def _init_worker(data_dir, prompts_dir, artifacts_dir=None, bundle=None):
+    workflow = load_workflow(data_dir)
+    _worker_state['workflow'] = workflow
+    _worker_state['prompts'] = load_prompts(workflow, prompts_dir)
+    _worker_state['digests'] = load_artifacts(workflow, artifacts_dir) if artifacts_dir else {}
+    _worker_state['bundle'] = bundle
+
+
+def _render_to_dir(brief_path, out_dir):
+    """Worker entry point: returns (brief name, steps written, elapsed_ms, error, unfilled slot labels)."""
+    started = time.perf_counter()
+    brief_path = Path(brief_path)
+    try:
+        with brief_path.open('r', encoding='utf-8') as fh:
+            brief = json.load(fh)
+        bundle = _worker_state['bundle']
+        if bundle:
+            Path(out_dir).mkdir(parents=True, exist_ok=True)
+            count = write_bundle(Path(out_dir) / f'{brief_path.stem}.zip', brief, _worker_state['workflow'],
+                                 _worker_state['prompts'], _worker_state['digests'], *bundle)
+        else:
+            target = Path(out_dir) / brief_path.stem
+            target.mkdir(parents=True, exist_ok=True)
+            rendered = render_brief(brief, _worker_state['workflow'], _worker_state['prompts'],
+                                    _worker_state['digests'])
+            for prompt_id, text in rendered:
+                (target / f'prompt-{prompt_id}.txt').write_text(text, encoding='utf-8')
+            count = len(rendered)
+        unfilled = unfilled_slots(brief, _worker_state['workflow'], _worker_state['prompts'])
+        error = None
+    except Exception as exc:
+        count, error, unfilled = 0, f'{type(exc).__name__}: {exc}', []
+    return brief_path.name, count, (time.perf_counter() - started) * 1000, error, unfilled
+
+
+def render_batch(brief_paths, out_dir, jobs=1, data_dir=DATA_DIR, prompts_dir=PROMPTS_DIR, artifacts_dir=None,
+                 bundle=None):
+    """Render every brief into out_dir/<brief stem>/ (or out_dir/<brief stem>.zip
+    when bundle is a (scope, completed) pair); returns per-brief results."""
+    args = (brief_paths, [out_dir] * len(brief_paths))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(data_dir, prompts_dir, artifacts_dir, bundle)) as pool:
+            return list(pool.map(_render_to_dir, *args))
+    _init_worker(data_dir, prompts_dir, artifacts_dir, bundle)
+    return list(map(_render_to_dir, *args))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render workflow prompts for engagement briefs.')
+    parser.add_argument('briefs', nargs='+', type=Path, help='engagement brief JSON file(s)')
+    parser.add_argument('--out', type=Path, required=True, help='output directory')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='number of worker processes (default: 1)')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR, help=f'default: {DATA_DIR}')
+    parser.add_argument('--prompts-dir', type=Path, default=PROMPTS_DIR, help=f'default: {PROMPTS_DIR}')
+    parser.add_argument('--artifacts', type=Path, metavar='DIR',
+                        help='directory of step artifacts named <STEP>.<ext>, digested into later prompts')
+    parser.add_argument('--bundle', action='store_true', help='write each brief as <brief>.zip with a manifest')
+    parser.add_argument('--scope', choices=('all', 'unlocked'), default='all',
+                        help='steps to include in a bundle (default: all)')
+    parser.add_argument('--completed', default='', metavar='STEPS',
+                        help='comma-separated steps already complete, e.g. P1.1,P1.2')
+    args = parser.parse_args()
+
+    missing = [str(path) for path in args.briefs if not path.exists()]
+    if missing:
+        print(f'ERROR: brief(s) not found: {", ".join(missing)}')
+        sys.exit(1)
+    if args.artifacts and not args.artifacts.is_dir():
+        print(f'ERROR: artifacts directory not found: {args.artifacts}')
+        sys.exit(1)
+
+    started = time.perf_counter()
+    completed = tuple(step.strip() for step in args.completed.split(',') if step.strip())
+    bundle = (args.scope, completed) if args.bundle else None
+    results = render_batch(args.briefs, args.out, max(1, args.jobs), args.data_dir, args.prompts_dir,
+                           args.artifacts, bundle)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for name, count, ms, error, unfilled in results:
+        if error:
+            print(f'  FAILED: {name}: {error}')
+        else:
+            print(f'  RENDERED: {name} ({count} prompts, {ms:.0f} ms)')
+            if unfilled:
+                print(f'    unfilled ENGAGEMENT CONTEXT fields: {", ".join(unfilled)}')
+
+    failed = sum(1 for _, _, _, error, _ in results if error)
+    print(f'\nDone in {elapsed:.0f} ms. {len(results) - failed} of {len(results)} briefs rendered to {args.out}.')
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
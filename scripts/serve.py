@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Serve the app locally (or to a team) with cacheable, pre-compressed assets.
+
+index.html is split into a small HTML shell plus content-hash-named assets:
+  /assets/app.<hash>.css   the page styles
+  /assets/data.<hash>.js   the INLINED_* payload declarations (and the
+                           ?perf=1 marks around them)
+  /assets/app.<hash>.js    the application code
+Assets are immutable (`Cache-Control: immutable`, one year). The shell,
+prompt files, data/ and sw.js are served with strong ETags and
+`Cache-Control: no-cache`, so a repeat visit costs a 304 for the shell and
+nothing for unchanged assets. Prompt bodies requested with the page's
+`?v=<rev>` cache-buster are immutable too. No other file in the checkout is
+served (see STATIC_FILES).
+
+/pack-manifest.json describes this split page (shell, assets and prompt
+bodies with their content hashes) rather than the file build_html.py writes,
+so sw.js caches exactly what the served page loads.
+
+Text responses are compressed once, up front, with gzip (and brotli when the
+`brotli` package is installed) and picked per request from Accept-Encoding.
+
+The page is rendered in memory: index.html's payload lines are regenerated
+from data/ and prompts/ with build_html.py's payload builders, so serving
+never writes index.html, index-standalone.html or pack-manifest.json, and
+several servers can share one checkout. data/, prompts/ and index.html are
+polled for changes. A change re-renders and re-splits the page and pushes a
+reload to every open page over server-sent events at /__events.
+
+Usage:
+  python scripts/serve.py                     # http://127.0.0.1:8000
+  python scripts/serve.py --host 0.0.0.0 --port 8080 --quiet
+  python scripts/serve.py --no-reload         # no file watching or live reload
+"""
+
+import argparse
+import asyncio
+from email.utils import formatdate
+import gzip
+import hashlib
+from http import HTTPStatus
+import json
+import mimetypes
+from pathlib import Path
+import re
+import sys
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import build_html
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PAGE_PATH = REPO_ROOT / 'index.html'
+WATCH_GLOBS = ('data/*.json', 'prompts/*.json', 'index.html')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+MIN_COMPRESS_BYTES = 1024
+MAX_HEADER_BYTES = 16 * 1024
+KEEPALIVE_SECONDS = 15
+
+# Repository files the page and sw.js request (the split assets are served from
+# memory under /assets/); every other path is a 404. The server may be bound to
+# a shared interface, so nothing else in the checkout is exposed, and the
+# packs/ store of per-client prompt packs is refused outright.
+STATIC_FILES = ('sw.js', 'favicon.ico')
+STATIC_DIRS = {'prompts': '.json', 'data': '.json'}
+DENIED_DIRS = ('packs',)
+
+EVENTS_PATH = '/__events'
+PACK_MANIFEST_PATH = '/pack-manifest.json'
+# With the offline cache active, the page asks sw.js to fetch the new pack
+# before reloading; otherwise the reload would be answered from the old one.
+RELOAD_SCRIPT = ("<script>new EventSource('" + EVENTS_PATH + "').addEventListener('reload', function() {"
+                 " var sw = navigator.serviceWorker && navigator.serviceWorker.controller;"
+                 " if (!sw) { location.reload(); return; }"
+                 " navigator.serviceWorker.addEventListener('message', function() { location.reload(); });"
+                 " sw.postMessage({ type: 'check' }); });</script>")
+
+# The ?perf=1 panel times the payloads between these two declarations, so they
+# move into the data asset with the payload lines: first and last.
+PERF_MARKS = ('PERF_SCRIPT_START', 'PERF_PAYLOAD_END')
+
+# Page-level blocks start a line; <style> elements inside inline SVGs stay put.
+STYLE_BLOCK = re.compile(r'^<style>(.*?)</style>', re.S | re.M)
+SCRIPT_BLOCK = re.compile(r'^<script>(.*?)</script>', re.S | re.M)
+
+
+# ── Responses ────────────────────────────────────────────────────────────────
+
+def content_type(path):
+    kind = mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
+    if kind.startswith('text/') or kind in ('application/javascript', 'application/json'):
+        kind += '; charset=utf-8'
+    return kind
+
+
+def encode_variants(body, kind):
+    """{encoding: bytes} holding the identity body plus every smaller compressed form."""
+    variants = {'identity': body}
+    if len(body) < MIN_COMPRESS_BYTES or not kind.startswith(COMPRESSIBLE):
+        return variants
+    compressed = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed['br'] = brotli.compress(body, quality=11)
+    variants.update({name: data for name, data in compressed.items() if len(data) < len(body)})
+    return variants
+
+
+class Resource:
+    """One response body with its pre-compressed variants and validators."""
+
+    def __init__(self, body, kind, cache_control):
+        self.kind = kind
+        self.cache_control = cache_control
+        self.digest = hashlib.sha256(body).hexdigest()[:16]
+        self.variants = encode_variants(body, kind)
+
+    def etag(self, encoding):
+        return f'"{self.digest}"' if encoding == 'identity' else f'"{self.digest}-{encoding}"'
+
+
+def pick_encoding(accept, variants):
+    """Best encoding in variants that Accept-Encoding allows (br, then gzip)."""
+    allowed = set()
+    for item in accept.split(','):
+        name, _, params = item.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q=') and q[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        allowed.add(name.strip().lower())
+    for name in ('br', 'gzip'):
+        if name in variants and (name in allowed or '*' in allowed):
+            return name
+    return 'identity'
+
+
+def not_modified(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+# ── Page build ───────────────────────────────────────────────────────────────
+
+def split_page(html):
+    """Return (shell HTML, {asset name: Resource}) for a built index.html."""
+    assets = {}
+
+    def asset(stem, ext, text):
+        body = text.encode('utf-8')
+        name = f'{stem}.{hashlib.sha256(body).hexdigest()[:12]}.{ext}'
+        assets[name] = Resource(body, content_type(name), IMMUTABLE)
+        return f'/assets/{name}'
+
+    def style(match):
+        return f'<link rel="stylesheet" href="{asset("app", "css", match.group(1))}">'
+
+    def script(match):
+        code = match.group(1).split('\n')
+        data = [line for line in code if build_html.declared_name(line)]
+        tags = []
+        # Top-level consts in one classic script are visible to the next, so the
+        # payloads can live in their own asset and change independently of the code.
+        if data:
+            marks = {perf_mark(line): line for line in code if perf_mark(line)}
+            data = [marks.get(PERF_MARKS[0], '')] + data + [marks.get(PERF_MARKS[1], '')]
+            code = [line for line in code if not build_html.declared_name(line) and not perf_mark(line)]
+            tags.append(f'<script src="{asset("data", "js", chr(10).join(data))}"></script>')
+        tags.append(f'<script src="{asset("app", "js", chr(10).join(code))}"></script>')
+        return ''.join(tags)
+
+    shell = STYLE_BLOCK.sub(style, html)
+    shell = SCRIPT_BLOCK.sub(script, shell)
+    return shell, assets
+
+
+def static_allowed(parts):
+    """True if the repo-relative path parts name a file the server may send."""
+    if any(not part or part.startswith('.') for part in parts) or parts[0] in DENIED_DIRS:
+        return False
+    if len(parts) == 1:
+        return parts[0] in STATIC_FILES
+    suffix = STATIC_DIRS.get(parts[0])
+    return len(parts) == 2 and suffix is not None and parts[1].endswith(suffix)
+
+
+def perf_mark(line):
+    """Return the mark name if the line declares one of PERF_MARKS."""
+    stripped = line.lstrip()
+    return next((mark for mark in PERF_MARKS if stripped.startswith(f'const {mark} ')), None)
+
+
+def watched_files():
+    """{path: (mtime_ns, size)} for every file whose change should trigger a rebuild."""
+    stamps = {}
+    for pattern in WATCH_GLOBS:
+        for path in REPO_ROOT.glob(pattern):
+            st = path.stat()
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+# ── Server ───────────────────────────────────────────────────────────────────
+
+class Site:
+    def __init__(self, live_reload, quiet):
+        self.live_reload = live_reload
+        self.quiet = quiet
+        self.shell = None
+        self.pack = None
+        self.hashes = build_html.read_manifest()['sources']
+        self.assets = {}
+        self.static = {}
+        self.listeners = set()
+
+    def load(self):
+        """Render the page with current payloads and re-split it; returns the asset count."""
+        self.hashes = build_html.hash_sources(build_html.source_paths(), self.hashes)
+        html = build_html.render_html(PAGE_PATH, build_html.TARGETS[PAGE_PATH.name], self.hashes,
+                                      {'compress': False})
+        build_html.prune_fragments(self.hashes)
+        shell, assets = split_page(html)
+        if self.live_reload:
+            shell = shell.replace('</body>', RELOAD_SCRIPT + '</body>', 1)
+        # Keep earlier assets: pages still open may request them until they reload.
+        self.assets.update(assets)
+        body = shell.encode('utf-8')
+        self.shell = Resource(body, 'text/html; charset=utf-8', REVALIDATE)
+        self.pack = Resource(json.dumps(self.pack_manifest(body, assets), indent=2).encode('utf-8'),
+                             'application/json', REVALIDATE)
+        return len(assets)
+
+    def pack_manifest(self, shell, assets):
+        """The offline pack for the split page: shell, current assets and prompt bodies."""
+        resources = build_html.prompt_resources(self.hashes)
+        resources['index.html'] = hashlib.sha256(shell).hexdigest()[:12]
+        for name in assets:
+            # Asset names already carry their content hash: <stem>.<hash>.<ext>.
+            resources[f'assets/{name}'] = name.split('.')[-2]
+        return build_html.pack_manifest(resources)
+
+    def static_file(self, rel, query):
+        """Resource for an allow-listed repository file, re-read only when its stat changes."""
+        parts = tuple(rel.split('/'))
+        if not static_allowed(parts):
+            return None
+        path = REPO_ROOT.joinpath(*parts)
+        # A symlink must not lead outside the directory it was allowed in.
+        try:
+            path.resolve().relative_to(REPO_ROOT.joinpath(*parts[:-1]).resolve())
+        except (ValueError, OSError):
+            return None
+        if not path.is_file():
+            return None
+        st = path.stat()
+        # The page requests prompt bodies as prompts/<file>?v=<content revision>.
+        cache_control = IMMUTABLE if parts[0] == 'prompts' and 'v' in query else REVALIDATE
+        key = (path, cache_control)
+        cached = self.static.get(key)
+        if cached and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+        resource = Resource(path.read_bytes(), content_type(path), cache_control)
+        self.static[key] = ((st.st_mtime_ns, st.st_size), resource)
+        return resource
+
+    def resolve(self, path, query):
+        if path in ('/', '/index.html'):
+            return self.shell
+        if path == PACK_MANIFEST_PATH:
+            return self.pack
+        if path.startswith('/assets/'):
+            return self.assets.get(path[len('/assets/'):])
+        return self.static_file(unquote(path).lstrip('/'), query)
+
+    # ── Connections ──────────────────────────────────────────────────────────
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ')
+                except ValueError:
+                    await self.send(writer, HTTPStatus.BAD_REQUEST, {}, b'')
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+                url = urlsplit(target)
+                if url.path == EVENTS_PATH and self.live_reload:
+                    await self.events(writer)
+                    break
+                await self.respond(writer, method, url.path, parse_qs(url.query), headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, method, path, query, headers, keep_alive):
+        started = time.perf_counter()
+        connection = {'Connection': 'keep-alive' if keep_alive else 'close'}
+        if method not in ('GET', 'HEAD'):
+            status, encoding, size = HTTPStatus.METHOD_NOT_ALLOWED, 'identity', 0
+            await self.send(writer, status, dict(connection, Allow='GET, HEAD'), b'')
+        else:
+            resource = self.resolve(path, query)
+            if resource is None:
+                status, encoding, size = HTTPStatus.NOT_FOUND, 'identity', 0
+                await self.send(writer, status, connection, b'Not found\n', method == 'HEAD')
+            else:
+                encoding = pick_encoding(headers.get('accept-encoding', ''), resource.variants)
+                etag = resource.etag(encoding)
+                common = dict(connection, **{'ETag': etag, 'Cache-Control': resource.cache_control,
+                                             'Vary': 'Accept-Encoding'})
+                if not_modified(headers.get('if-none-match'), etag):
+                    status, size = HTTPStatus.NOT_MODIFIED, 0
+                    await self.send(writer, status, common, b'', True)
+                else:
+                    body = resource.variants[encoding]
+                    status, size = HTTPStatus.OK, len(body)
+                    extra = {'Content-Type': resource.kind}
+                    if encoding != 'identity':
+                        extra['Content-Encoding'] = encoding
+                    await self.send(writer, status, dict(common, **extra), body, method == 'HEAD')
+        if not self.quiet:
+            ms = (time.perf_counter() - started) * 1000
+            detail = f', {encoding}' if encoding != 'identity' else ''
+            print(f'  {method} {path} {status.value} ({size / 1024:.1f} KB{detail}, {ms:.1f} ms)')
+
+    async def send(self, writer, status, headers, body, head_only=False):
+        lines = [f'HTTP/1.1 {status.value} {status.phrase}',
+                 f'Date: {formatdate(usegmt=True)}',
+                 f'Content-Length: {len(body)}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if not head_only:
+            writer.write(body)
+        await writer.drain()
+
+    async def events(self, writer):
+        """Hold a server-sent events stream open until the client goes away."""
+        queue = asyncio.Queue()
+        self.listeners.add(queue)
+        try:
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                         b'Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\nretry: 1000\n\n')
+            await writer.drain()
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    message = ': ping\n\n'
+                writer.write(message.encode('utf-8'))
+                await writer.drain()
+        finally:
+            self.listeners.discard(queue)
+
+    async def watch(self, interval):
+        """Poll the sources; rebuild and push a reload to every open page on change."""
+        loop = asyncio.get_running_loop()
+        stamps = watched_files()
+        while True:
+            await asyncio.sleep(interval)
+            current = watched_files()
+            if current == stamps:
+                continue
+            changed = {path for path in set(current) | set(stamps) if current.get(path) != stamps.get(path)}
+            changed = sorted(str(path.relative_to(REPO_ROOT)) for path in changed)
+            print(f'  CHANGED: {", ".join(changed)}')
+            stamps = current
+            try:
+                await loop.run_in_executor(None, self.load)
+            except Exception as exc:
+                print(f'  BUILD FAILED: {type(exc).__name__}: {exc}')
+            for queue in list(self.listeners):
+                queue.put_nowait(f'event: reload\ndata: {self.shell.digest}\n\n')
+
+
+async def serve(host, port, live_reload, poll, quiet):
+    site = Site(live_reload, quiet)
+    count = site.load()
+    server = await asyncio.start_server(site.handle, host, port, limit=MAX_HEADER_BYTES)
+    encodings = 'br, gzip' if brotli is not None else 'gzip'
+    print(f'\nServing {REPO_ROOT} at http://{host}:{port}/ ({count} assets, {encodings})')
+    if live_reload:
+        print(f'Watching {", ".join(WATCH_GLOBS)} for changes.')
+        asyncio.get_running_loop().create_task(site.watch(poll))
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the app with hashed, pre-compressed assets and live reload.')
+    parser.add_argument('--host', default='127.0.0.1', help='interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on (default: 8000)')
+    parser.add_argument('--no-reload', action='store_true', help='do not watch sources or push live reloads')
+    parser.add_argument('--poll', type=float, default=0.5, metavar='SECONDS',
+                        help='source polling interval (default: 0.5)')
+    parser.add_argument('--quiet', action='store_true', help='do not log requests')
+    args = parser.parse_args()
+
+    if not PAGE_PATH.exists():
+        print(f'ERROR: page not found: {PAGE_PATH}')
+        sys.exit(1)
+    try:
+        asyncio.run(serve(args.host, args.port, not args.no_reload, args.poll, args.quiet))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
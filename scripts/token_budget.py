@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Estimate the token cost of every rendered workflow prompt and flag steps that
+exceed a budget.
+
+Each brief is rendered with the same rules as the page (see render_prompts.py)
+and every step's prompt is split into:
+  - header:      the ENGAGEMENT CONTEXT block update_prompts.py puts at the
+                 start of the instruction, with its placeholders filled from
+                 the brief;
+  - instruction: the rest of the prompt file's instruction, without the
+                 {{ENGAGEMENT_DATA}} placeholder;
+  - context:     what the page appends or substitutes for this brief — the
+                 compact snapshot limited to the step's `context_fields`, or
+                 the whole brief for {{ENGAGEMENT_DATA}} steps;
+  - saved:       tokens the step's `context_fields` keep out of the prompt,
+                 compared with the full snapshot.
+The parts are counted separately, so they can differ from the total by a few
+tokens where tiktoken merges text across their boundaries.
+
+Tokens are counted with tiktoken's cl100k_base encoding when the `tiktoken`
+package is installed, otherwise estimated as one token per four characters.
+With no brief, an empty one is used, which measures the static cost of each
+prompt. Exit status is 1 when any step is over --budget.
+
+Usage:
+  python scripts/token_budget.py
+  python scripts/token_budget.py brief.json --budget 10000
+  python scripts/token_budget.py briefs/*.json --report budget.json
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+import sys
+import time
+
+import render_prompts
+from update_prompts import CONTEXT_BLOCK
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / 'data'
+PROMPTS_DIR = REPO_ROOT / 'prompts'
+
+DEFAULT_BUDGET = 16000
+
+
+# ── Token counting ───────────────────────────────────────────────────────────
+
+def token_counter():
+    """Return (name, count function) for the best available estimator."""
+    if tiktoken is not None:
+        encoding = tiktoken.get_encoding('cl100k_base')
+        return 'cl100k_base', lambda text: len(encoding.encode(text, disallowed_special=()))
+    return 'chars/4', lambda text: math.ceil(len(text) / 4)
+
+
+# ── Analysis ─────────────────────────────────────────────────────────────────
+
+def analyse_step(step, prompt_json, brief, count):
+    """Token breakdown of one rendered step."""
+    raw = prompt_json.get('instruction') or ''
+    body = raw[len(CONTEXT_BLOCK):] if raw.startswith(CONTEXT_BLOCK) else raw
+    # Slots are only filled in the leading block, so the filled header is
+    # whatever precedes the unchanged body.
+    filled, _ = render_prompts.fill_slots(raw, brief)
+    header = filled[:len(filled) - len(body)]
+    rendered = render_prompts.build_prompt_text(step, prompt_json, brief)
+    # The context is what the rendered prompt holds beyond the filled
+    # instruction: the brief in place of {{ENGAGEMENT_DATA}} (after the
+    # replacement's $ patterns), or the appended snapshot.
+    before, placeholder, after = filled.partition(render_prompts.ENGAGEMENT_DATA)
+    if not placeholder:
+        before, after = filled, ''
+    body = body.replace(render_prompts.ENGAGEMENT_DATA, '', 1)
+    context = rendered[len(before):len(rendered) - len(after)]
+    full_step = {key: value for key, value in step.items() if key != 'context_fields'}
+    full = render_prompts.build_prompt_text(full_step, prompt_json, brief)
+
+    total = count(rendered)
+    return {
+        'step': step['prompt_id'],
+        'file': step['file'],
+        'header': count(header),
+        'instruction': count(body),
+        'context': count(context),
+        'saved': count(full) - total,
+        'total': total,
+        'context_fields': render_prompts.context_fields(step),
+    }
+
+
+def analyse_brief(brief, workflow, prompts, count):
+    rows = []
+    for step in render_prompts.workflow_steps(workflow):
+        prompt_json = prompts.get(step['file'])
+        if prompt_json is not None:
+            rows.append(analyse_step(step, prompt_json, brief, count))
+    return rows
+
+
+def analyse(briefs, budget, data_dir=DATA_DIR, prompts_dir=PROMPTS_DIR):
+    """Analyse every (name, brief) pair; returns the report dict."""
+    started = time.perf_counter()
+    estimator, count = token_counter()
+    workflow = render_prompts.load_workflow(data_dir)
+    prompts = render_prompts.load_prompts(workflow, prompts_dir)
+    missing = [step['file'] for step in render_prompts.workflow_steps(workflow) if step['file'] not in prompts]
+
+    results = []
+    for name, brief in briefs:
+        rows = analyse_brief(brief, workflow, prompts, count)
+        results.append({
+            'brief': name,
+            'steps': rows,
+            'total': sum(row['total'] for row in rows),
+            'saved': sum(row['saved'] for row in rows),
+            'over_budget': [row['step'] for row in rows if row['total'] > budget],
+        })
+    return {
+        'estimator': estimator,
+        'budget': budget,
+        'missing_prompts': missing,
+        'briefs': results,
+        'ok': not any(result['over_budget'] for result in results),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+# ── Output ───────────────────────────────────────────────────────────────────
+
+COLUMNS = ('header', 'instruction', 'context', 'saved', 'total')
+
+
+def print_report(report):
+    print(f'Token estimator: {report["estimator"]}, budget {report["budget"]:,} tokens per step')
+    for path in report['missing_prompts']:
+        print(f'  WARNING: prompt file not found, step skipped: {path}')
+
+    for result in report['briefs']:
+        print(f'\n{result["brief"]}')
+        print(f'  {"Step":<7}' + ''.join(f'{col:>13}' for col in COLUMNS) + '  Context fields')
+        for row in result['steps']:
+            flag = '  OVER BUDGET' if row['step'] in result['over_budget'] else ''
+            fields = ', '.join(row['context_fields'])
+            print(f'  {row["step"]:<7}' + ''.join(f'{row[col]:>13,}' for col in COLUMNS) + f'  {fields}{flag}')
+        print(f'  Total {result["total"]:,} tokens across {len(result["steps"])} steps; '
+              f'context_fields saved {result["saved"]:,}.')
+
+    over = sum(len(result['over_budget']) for result in report['briefs'])
+    print(f'\nDone in {report["elapsed_ms"]:.0f} ms. {len(report["briefs"])} brief(s) analysed, '
+          f'{over} step(s) over budget.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Estimate token counts of rendered workflow prompts.')
+    parser.add_argument('briefs', nargs='*', type=Path,
+                        help='engagement brief JSON file(s) (default: an empty brief)')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, metavar='TOKENS',
+                        help=f'per-step token budget (default: {DEFAULT_BUDGET})')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR, help=f'default: {DATA_DIR}')
+    parser.add_argument('--prompts-dir', type=Path, default=PROMPTS_DIR, help=f'default: {PROMPTS_DIR}')
+    parser.add_argument('--report', type=Path, metavar='FILE',
+                        help='write the JSON report to FILE ("-" for stdout)')
+    args = parser.parse_args()
+
+    briefs = [('(empty brief)', {})]
+    if args.briefs:
+        missing = [str(path) for path in args.briefs if not path.exists()]
+        if missing:
+            print(f'ERROR: brief(s) not found: {", ".join(missing)}')
+            sys.exit(1)
+        briefs = []
+        for path in args.briefs:
+            with path.open('r', encoding='utf-8') as fh:
+                briefs.append((path.name, json.load(fh)))
+
+    report = analyse(briefs, args.budget, args.data_dir, args.prompts_dir)
+
+    if args.report and str(args.report) == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print_report(report)
+        if args.report:
+            with args.report.open('w', encoding='utf-8') as fh:
+                json.dump(report, fh, indent=2)
+            print(f'Report written to {args.report}')
+
+    if not report['ok']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+/*
+ * Offline cache for the launcher, registered by index.html when it is served
+ * over HTTP(S).
+ *
+ * pack-manifest.json (written by scripts/build_html.py, or generated by
+ * scripts/serve.py for its split page) lists every resource the page loads
+ * with its content hash. Each resource is cached as `<path>?v=<hash>`, so a
+ * new release only downloads the resources whose hash changed, and resources
+ * that are no longer listed are dropped once the new pack is complete.
+ *
+ * Listed resources are answered from the cache, so the app starts without
+ * waiting on the network and works offline. Every page load also checks the
+ * manifest in the background. When a new pack has been cached, open pages get
+ * a `pack-updated` message and the next load uses it. A `check` message from
+ * a page runs the same check and answers with `pack-updated` or
+ * `pack-current`. Requests for anything else go to the network untouched.
+ */
+
+const PACK_FORMAT = 'delivery-launcher-pack/1';
+const CACHE_NAME = 'delivery-launcher-pack';
+const MANIFEST_URL = 'pack-manifest.json';
+// The manifest of the pack in the cache, stored in the cache itself.
+const CURRENT_KEY = 'pack-manifest.json?current';
+
+let updating = null;
+
+function scopeUrl(path) {
+  return new URL(path, self.registration.scope).href;
+}
+
+// Repository-relative path of a request inside the scope, or null outside it.
+function scopePath(url) {
+  const scope = self.registration.scope;
+  if (!url.href.startsWith(scope)) return null;
+  const path = url.href.slice(scope.length).split(/[?#]/)[0];
+  return path === '' ? 'index.html' : decodeURIComponent(path);
+}
+
+function versionedUrl(path, hash) {
+  return scopeUrl(`${path}?v=${hash}`);
+}
+
+function currentManifest(cache) {
+  return cache.match(scopeUrl(CURRENT_KEY)).then(res => res ? res.json() : null);
+}
+
+function notifyClients(message) {
+  return self.clients.matchAll({ includeUncontrolled: true }).then(clients => {
+    clients.forEach(client => client.postMessage(message));
+  });
+}
+
+// Fetch the manifest and cache every resource whose hash changed; only then
+// does the new manifest become current. One check runs at a time.
+function updatePack() {
+  if (updating) return updating;
+  updating = caches.open(CACHE_NAME).then(cache => Promise.all([
+    fetch(scopeUrl(MANIFEST_URL), { cache: 'no-store' }).then(res => {
+      if (!res.ok) throw new Error(`${MANIFEST_URL}: HTTP ${res.status}`);
+      return res.json();
+    }),
+    currentManifest(cache)
+  ]).then(([manifest, current]) => {
+    if (manifest.format !== PACK_FORMAT) throw new Error(`${MANIFEST_URL}: unknown format ${manifest.format}`);
+    if (current && current.version === manifest.version) return { type: 'pack-current', version: current.version };
+    const entries = Object.entries(manifest.resources);
+    let fetched = 0;
+    let bytes = 0;
+    return Promise.all(entries.map(([path, hash]) => {
+      const url = versionedUrl(path, hash);
+      return cache.match(url).then(hit => hit || fetch(url, { cache: 'no-cache' }).then(res => {
+        if (!res.ok) throw new Error(`${path}: HTTP ${res.status}`);
+        return res.clone().arrayBuffer().then(body => {
+          fetched++;
+          bytes += body.byteLength;
+          return cache.put(url, res);
+        });
+      }));
+    })).then(() => cache.put(scopeUrl(CURRENT_KEY), new Response(JSON.stringify(manifest), {
+      headers: { 'Content-Type': 'application/json' }
+    }))).then(() => cache.keys()).then(keys => {
+      const keep = new Set(entries.map(([path, hash]) => versionedUrl(path, hash)).concat(scopeUrl(CURRENT_KEY)));
+      return Promise.all(keys.filter(req => !keep.has(req.url)).map(req => cache.delete(req)));
+    }).then(() => ({
+      type: 'pack-updated',
+      version: manifest.version,
+      previous: current ? current.version : null,
+      fetched,
+      bytes,
+      total: entries.length
+    }));
+  })).then(message => {
+    updating = null;
+    return notifyClients(message).then(() => message);
+  }, err => {
+    updating = null;
+    throw err;
+  });
+  return updating;
+}
+
+function backgroundUpdate() {
+  return updatePack().catch(err => console.warn('Offline pack not updated:', err.message));
+}
+
+// Cached copy of a listed resource: the version the page asked for (?v=),
+// else the current pack's. Misses go to the network and are cached when they
+// match the current pack; offline, any cached version will do.
+function respond(request, path) {
+  return caches.open(CACHE_NAME).then(cache => currentManifest(cache).then(manifest => {
+    const hash = manifest && manifest.resources[path];
+    if (!hash) return fetch(request);
+    const wanted = new URL(request.url).searchParams.get('v') || hash;
+    const url = versionedUrl(path, wanted);
+    return cache.match(url).then(hit => hit || fetch(request).then(res => {
+      if (res.ok && wanted === hash) cache.put(url, res.clone());
+      return res;
+    }, err => cache.match(url, { ignoreSearch: true }).then(stale => {
+      if (stale) return stale;
+      throw err;
+    })));
+  }));
+}
+
+self.addEventListener('install', event => {
+  event.waitUntil(updatePack().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  if (request.method !== 'GET' || request.headers.get('Accept') === 'text/event-stream') return;
+  const path = scopePath(new URL(request.url));
+  if (path === null || path === MANIFEST_URL || path === 'sw.js') return;
+  event.respondWith(respond(request, path));
+  if (request.mode === 'navigate') event.waitUntil(backgroundUpdate());
+});
+
+self.addEventListener('message', event => {
+  if (event.data && event.data.type === 'check') {
+    event.waitUntil(updatePack().catch(err => {
+      event.source.postMessage({ type: 'pack-error', message: err.message });
+    }));
+  }
+});
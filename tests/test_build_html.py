@@ -0,0 +1,60 @@
+"""
+Check build_html.py's flat, interned catalogue encoding: data/*.json must
+encode and decode back exactly, and the INLINED_DATA line in each HTML
+target must decode to the current sources.
+"""
+
+import json
+
+import pytest
+
+import build_html
+from conftest import REPO_ROOT
+
+
+def dumped(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+@pytest.fixture(scope='module')
+def sources():
+    data = {}
+    for key, name in build_html.DATA_SOURCES.items():
+        with (REPO_ROOT / 'data' / name).open('r', encoding='utf-8') as fh:
+            data[key] = json.load(fh)
+    return data
+
+
+@pytest.fixture(scope='module')
+def round_trip(sources):
+    literal = json.dumps(build_html.encode_data(sources), ensure_ascii=False, separators=(',', ':'))
+    return build_html.decode_data(json.loads(literal))
+
+
+@pytest.mark.parametrize('key', list(build_html.DATA_SOURCES))
+def test_source_round_trips(key, sources, round_trip):
+    assert dumped(round_trip[key]) == dumped(sources[key])
+
+
+def test_catalogues_are_flattened(sources):
+    encoded = build_html.encode_data(sources)
+    assert set(encoded['catalogues']) == set(build_html.CATALOGUE_SHAPES) & set(sources)
+
+
+@pytest.mark.parametrize('target', list(build_html.TARGETS))
+def test_inlined_data_decodes_to_sources(target, sources):
+    with (REPO_ROOT / target).open('r', encoding='utf-8') as fh:
+        literal = next(line.split('=', 1)[1].strip().rstrip(';') for line in fh
+                       if build_html.declared_name(line) == 'INLINED_DATA')
+    decoded = build_html.decode_data(json.loads(literal))
+    for key in build_html.DATA_SOURCES:
+        assert dumped(decoded.get(key)) == dumped(sources[key]), f'{target}: {key}'
+
+
+def test_prune_fragments_keeps_only_current_sources(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_html, 'FRAGMENT_DIR', tmp_path)
+    for digest in ('aaa', 'bbb', 'ccc'):
+        (tmp_path / f'{digest}.json').write_text('{}', encoding='utf-8')
+    hashes = {'data/a.json': {'sha256': 'aaa'}, 'prompts/b.json': {'sha256': 'bbb'}}
+    assert build_html.prune_fragments(hashes) == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['aaa.json', 'bbb.json']
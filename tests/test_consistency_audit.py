@@ -0,0 +1,224 @@
+"""
+Pin consistency_audit.py's heuristics: column kinds read from table headers,
+day-first dates, the similar() thresholds, RACI detection and the open-items
+merge, plus one PASS, FAIL and NOT CHECKED case for each check group, run
+end to end over small Markdown artifacts.
+"""
+
+from datetime import date
+
+import pytest
+
+import consistency_audit
+from consistency_audit import column_kind, parse_date, run_audit, similar
+
+
+def write_artifacts(directory, artifacts):
+    for name, text in artifacts.items():
+        path = directory / name
+        if isinstance(text, bytes):
+            path.write_bytes(text)
+        else:
+            path.write_text(text, encoding='utf-8')
+    return directory
+
+
+def results(report, check):
+    """(status, finding) for every record of the check whose name contains check."""
+    found = [(rec['status'], rec['finding']) for rec in report['checks'] if check in rec['check']]
+    assert found, f'no check named like {check!r}'
+    return found
+
+
+# ── Heuristics ───────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('header, kind', [
+    ('WBS ID', 'id'),
+    ('Risk ID', 'id'),
+    ('Blocks Delivery Start (Y/N)', 'blocks'),
+    ('Workstream', 'workstream'),
+    ('Planned Start', 'start'),
+    ('Completion', 'end'),
+    ('Due Date', 'date'),
+    ('Escalation Path', 'escalation'),
+    ('Approval Authority', 'approver'),
+    ('Assigned To', 'owner'),
+    ('Role', 'role'),
+    ('Governance Forum', 'body'),
+    ('Effort (days)', 'days'),
+    ('WBS Element', 'element'),
+    ('Description', 'text'),
+    ('Mar 2026', 'month'),
+    ('M3', 'month'),
+    ('Engagement Manager', None),
+])
+def test_column_kind(header, kind):
+    assert column_kind(header) == kind
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2026-03-02', date(2026, 3, 2)),
+    ('02/03/2026', date(2026, 3, 2)),
+    ('Starts 2nd March, 2026', date(2026, 3, 2)),
+    ('March 2, 2026', date(2026, 3, 2)),
+    ('31/02/2026 or 01/03/2026', date(2026, 3, 1)),
+    ('TBC', None),
+])
+def test_parse_date_reads_numeric_dates_day_first(text, expected):
+    assert parse_date(text) == expected
+
+
+@pytest.mark.parametrize('a, b, threshold, expected', [
+    ('Finance transformation of the general ledger', 'Finance Transformation', 0.5, True),
+    ('Finance Transformation', 'Finance Operations', 0.5, False),
+    ('Steering Committee', 'Audit Committee', 0.8, False),
+    ('Executive Steering Committee', 'Steering Committee', 0.8, True),
+    ('Analyst', 'Analyst', 0.8, True),
+    ('the', 'the', 0.5, False),
+])
+def test_similar(a, b, threshold, expected):
+    assert similar(a, b, threshold) is expected
+
+
+# ── Check groups ─────────────────────────────────────────────────────────────
+
+WORKSTREAMS = '## Workstreams\n- Finance Transformation\n- Data Migration\n'
+WBS = ('| WBS ID | WBS Element |\n|---|---|\n'
+       '| 1.1 | Finance Transformation |\n| 1.2 | Data Migration |\n')
+SCOPE = (WORKSTREAMS + '\n## In Scope\n- Finance transformation of the general ledger\n'
+         '- Data migration from legacy systems\n\n## Out of Scope\n- Payroll outsourcing\n')
+
+CHARTER = 'Engagement Start Date: 02/03/2026\nEngagement End Date: 30 June 2026\n'
+SCHEDULE = 'Start Date: 2026-03-02\nEnd Date: June 30, 2026\n'
+
+RESOURCES = ('| Role | Start | End | Days |\n|---|---|---|---|\n'
+             '| Engagement Manager | 2026-03-02 | 2026-06-30 | 80 |\n'
+             '| Analyst | 2026-03-02 | 2026-06-30 | 100 |\n'
+             '| Total | | | 180 |\n')
+
+
+def budget(column, value):
+    return f'| Cost Line | {column} |\n|---|---|\n| Fees | {value} |\n'
+
+
+def raci(*roles):
+    codes = ('A', 'R', 'C/I')
+    return (f'| Activity | {" | ".join(roles)} |\n|{"---|" * (len(roles) + 1)}\n'
+            + ''.join(f'| {activity} | {" | ".join(codes[(i + j) % 3] for j in range(len(roles)))} |\n'
+                      for i, activity in enumerate(('Plan', 'Build'))))
+
+
+GOVERNANCE = '## Governance Bodies\n- Steering Committee\n- Programme Board\n'
+
+
+def risk_register(escalation):
+    return ('| Risk ID | Risk | Owner | Escalation |\n|---|---|---|---|\n'
+            f'| R-001 | Data quality | Analyst | {escalation} |\n')
+
+
+def open_items(status, blocks='N'):
+    return ('| ID | Item | Owner | Status | Blocks Delivery Start |\n|---|---|---|---|---|\n'
+            f'| OI-1 | Confirm data access | Client CIO | {status} | {blocks} |\n')
+
+
+GROUP_CASES = {
+    'Scope Consistency': [
+        ('WBS Level 2 workstreams (P2.1) match the Engagement Charter',
+         {'P2.1.md': WBS, 'P1.5.md': WORKSTREAMS}, 'PASS'),
+        ('WBS Level 2 workstreams (P2.1) match the Engagement Charter',
+         {'P2.1.md': WBS, 'P1.5.md': '## Workstreams\n- Finance Transformation\n- Change Management\n'}, 'FAIL'),
+        ('WBS Level 2 workstreams (P2.1) match the Engagement Charter', {'P2.1.md': WBS}, 'NOT CHECKED'),
+        ('Every scope inclusion', {'P2.1.md': WBS, 'P1.3.md': SCOPE}, 'PASS'),
+        ('Every scope inclusion', {'P2.1.md': WBS, 'P1.3.md': SCOPE + '\n## Inclusions\n- Payroll redesign\n'},
+         'WARNING'),
+    ],
+    'Date Consistency': [
+        ('Engagement start date', {'P2.2.md': SCHEDULE, 'P1.5.md': CHARTER}, 'PASS'),
+        ('Engagement start date', {'P2.2.md': SCHEDULE.replace('2026-03-02', '2026-02-03'), 'P1.5.md': CHARTER},
+         'FAIL'),
+        ('Engagement start date', {'P2.2.md': SCHEDULE}, 'NOT CHECKED'),
+        ('Resource Plan dates', {'P2.4.md': RESOURCES, 'P2.2.md': SCHEDULE}, 'PASS'),
+        ('Resource Plan dates', {'P2.4.md': RESOURCES.replace('2026-06-30 | 80', '2026-07-31 | 80'),
+                                 'P2.2.md': SCHEDULE}, 'FAIL'),
+    ],
+    'Resource and Budget Consistency': [
+        ('Resource Plan effort', {'P2.4.md': RESOURCES, 'P2.6.md': budget('Days', '185')}, 'PASS'),
+        ('Resource Plan effort', {'P2.4.md': RESOURCES, 'P2.6.md': budget('Days', '250')}, 'FAIL'),
+        ('Resource Plan effort', {'P2.4.md': RESOURCES, 'P2.6.md': budget('Amount', '£1')}, 'NOT CHECKED'),
+        ('RACI roles', {'P2.5.md': raci('Engagement Manager', 'Analyst'), 'P2.4.md': RESOURCES}, 'PASS'),
+        ('RACI roles', {'P2.5.md': raci('Engagement Manager', 'Analyst', 'Data Architect'), 'P2.4.md': RESOURCES},
+         'WARNING'),
+    ],
+    'Governance Consistency': [
+        ('Risk Register escalation paths', {'P2.7.md': risk_register('Steering Committee'), 'P1.6.md': GOVERNANCE},
+         'PASS'),
+        ('Risk Register escalation paths', {'P2.7.md': risk_register('Audit Committee'), 'P1.6.md': GOVERNANCE},
+         'FAIL'),
+        ('Risk Register escalation paths', {'P2.7.md': risk_register('Steering Committee')}, 'NOT CHECKED'),
+        ('Risk IDs referenced elsewhere', {'P2.7.md': risk_register('PM'), 'P2.8.md': 'Linked to R1.\n'}, 'PASS'),
+        ('Risk IDs referenced elsewhere', {'P2.7.md': risk_register('PM'), 'P2.8.md': 'Linked to RISK-9.\n'}, 'FAIL'),
+    ],
+    'Open Items Consolidation': [
+        ('No open item blocks delivery start', {'P1.1.md': open_items('Open', 'N')}, 'PASS'),
+        ('No open item blocks delivery start', {'P1.1.md': open_items('Open', 'Y')}, 'FAIL'),
+        ('No open item blocks delivery start', {'P2.1.md': WBS}, 'NOT CHECKED'),
+        ('Items raised in Phase 1', {'P1.1.md': open_items('Open'), 'P2.8.md': open_items('Closed')}, 'PASS'),
+        ('Items raised in Phase 1', {'P1.1.md': open_items('Open'), 'P2.8.md': open_items('In progress')}, 'WARNING'),
+    ],
+}
+
+
+def group_cases():
+    for group, cases in GROUP_CASES.items():
+        for i, (check, artifacts, status) in enumerate(cases, 1):
+            yield pytest.param(group, check, artifacts, status, id=f'{group}-{i}-{status}')
+
+
+@pytest.mark.parametrize('group, check, artifacts, status', list(group_cases()))
+def test_check_groups(tmp_path, group, check, artifacts, status):
+    report = run_audit(write_artifacts(tmp_path, artifacts))
+    records = [rec for rec in report['checks'] if check in rec['check']]
+    assert [rec['status'] for rec in records] == [status]
+    assert records[0]['group'] == group
+    assert report['ok'] is (report['counts']['FAIL'] == 0)
+
+
+def test_every_group_has_a_pass_fail_and_not_checked_case(tmp_path):
+    report = run_audit(tmp_path)
+    assert {rec['status'] for rec in report['checks']} == {'NOT CHECKED'}
+    assert report['ok']
+    assert list(GROUP_CASES) == list(dict.fromkeys(rec['group'] for rec in report['checks']))
+    for group, cases in GROUP_CASES.items():
+        assert {'PASS', 'FAIL', 'NOT CHECKED'} <= {status for *_, status in cases}, group
+
+
+def test_blocking_item_is_flagged(tmp_path):
+    report = run_audit(write_artifacts(tmp_path, {'P1.1.md': open_items('Open', 'Y')}))
+    [check] = [rec for rec in report['checks'] if rec['check'] == 'No open item blocks delivery start']
+    assert check['blocks_delivery_start'] and check['documents'] == ['P1.1']
+    assert not report['ok']
+    assert [item['id'] for item in report['open_items']] == ['OI-1']
+
+
+def test_later_status_replaces_earlier_one(tmp_path):
+    report = run_audit(write_artifacts(tmp_path, {'P1.1.md': open_items('Open', 'Y'),
+                                                  'P2.8.md': open_items('Resolved', 'Y')}))
+    assert report['open_items'] == []
+    assert report['ok']
+
+
+# ── Artifact discovery ───────────────────────────────────────────────────────
+
+def test_text_artifact_is_preferred_over_binary(tmp_path):
+    write_artifacts(tmp_path, {'P1.1.docx': b'PK\x03\x04\xff\xfe binary', 'P1.1.md': open_items('Open', 'Y')})
+    report = run_audit(tmp_path)
+    assert report['artifacts']['P1.1'].endswith('P1.1.md')
+    assert report['unreadable_artifacts'] == {}
+
+
+def test_non_utf8_artifact_is_reported_unreadable(tmp_path):
+    write_artifacts(tmp_path, {'P1.1.docx': b'PK\x03\x04\xff\xfe binary'})
+    report = run_audit(tmp_path)
+    assert set(report['unreadable_artifacts']) == {'P1.1'}
+    assert all(status == 'NOT CHECKED' for status, _ in results(report, 'No open item blocks delivery start'))
+    assert consistency_audit.markdown(report).count('Unreadable artifacts: P1.1') == 1
@@ -0,0 +1,281 @@
+"""
+Check update_prompts.py's rule registry and insertion engine against the
+original sequential helpers: every shipped prompt, with each inserted
+directive stripped in turn and with all of them stripped, plus synthetic
+layouts the shipped prompts do not exercise, must come out byte for byte the
+same.
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from conftest import REPO_ROOT
+import update_prompts
+from update_prompts import (CONSISTENCY_AUDIT, CONTEXT_BLOCK, EXCEL_RATIONALISATIONS, FEE_BUILD, FEE_Q0,
+                            METHOD_BUILD_CPM, METHOD_BUILD_SCHEDULE, METHOD_Q0_CPM, METHOD_Q0_SCHEDULE, SKIP_FILES,
+                            apply_transforms, recover_interrupted_swap, rule, run_batch, thin_context_warning)
+
+PROMPTS_DIR = REPO_ROOT / 'prompts'
+
+
+# ── Reference implementation ─────────────────────────────────────────────────
+# The original sequential helpers, kept so the registry and insertion engine
+# can be checked for byte-identical output.
+
+def find_excel_anchor(inst):
+    for anchor in ('EXCEL WORKBOOK STRUCTURE', 'PWC FORMATTING STANDARDS FOR EXCEL'):
+        idx = inst.find(anchor)
+        if idx >= 0:
+            return idx, anchor
+    return -1, None
+
+
+def insert_q0_in_step1(inst, step1_anchor, q0_text):
+    """Insert q0_text before the first '1. ' after step1_anchor."""
+    step1_idx = inst.find(step1_anchor)
+    if step1_idx < 0:
+        return inst
+    search_from = step1_idx
+    # Find first occurrence of '\n1. ' after the STEP 1 heading
+    q1_idx = inst.find('\n1. ', search_from)
+    if q1_idx < 0:
+        return inst
+    return inst[:q1_idx + 1] + q0_text + inst[q1_idx + 1:]
+
+
+def insert_after_step3(inst, insert_text):
+    step3_idx = inst.find('STEP 3 — BUILD')
+    if step3_idx < 0:
+        step3_idx = inst.find('STEP 3 —')
+    if step3_idx < 0:
+        return inst
+    # Move to end of that line
+    eol = inst.find('\n', step3_idx)
+    if eol < 0:
+        return inst
+    return inst[:eol + 1] + '\n' + insert_text + inst[eol + 1:]
+
+
+def apply_transforms_sequential(fname, inst, artifact):
+    """Reference version of apply_transforms using repeated find/slice."""
+    changed = False
+
+    # 1. Context block
+    if 'ENGAGEMENT CONTEXT' not in inst:
+        inst = CONTEXT_BLOCK + inst
+        changed = True
+
+    # 2. Thin-context warning
+    if 'CONTEXT CHECK' not in inst:
+        step1_idx = inst.find('STEP 1 —')
+        if step1_idx < 0:
+            step1_idx = inst.find('STEP 1:')
+        if step1_idx >= 0:
+            inst = inst[:step1_idx] + thin_context_warning(artifact) + inst[step1_idx:]
+            changed = True
+
+    # 3. Excel rationalisation directive
+    if fname in EXCEL_RATIONALISATIONS and 'WORKBOOK RATIONALISATION' not in inst and 'NOTE: The Engagement Charter' not in inst:
+        excel_idx, anchor = find_excel_anchor(inst)
+        if excel_idx >= 0:
+            inst = inst[:excel_idx] + EXCEL_RATIONALISATIONS[fname] + inst[excel_idx:]
+            changed = True
+        elif fname == 'engagement_charter.json':
+            # No Excel section — just add the note before Step 3
+            step3_idx = inst.find('STEP 3')
+            if step3_idx >= 0:
+                inst = inst[:step3_idx] + EXCEL_RATIONALISATIONS[fname] + inst[step3_idx:]
+                changed = True
+
+    # 4. Fee structure branch (budget only)
+    if fname == 'budget_cost_baseline.json':
+        if 'Fee Structure Confirmation' not in inst:
+            inst = insert_q0_in_step1(inst, 'STEP 1 —', FEE_Q0)
+            changed = True
+        if 'FEE STRUCTURE ADAPTATION' not in inst:
+            inst = insert_after_step3(inst, FEE_BUILD)
+            changed = True
+
+    # 5a. Methodology branch — schedule
+    if fname == 'schedule_milestones.json':
+        if 'Delivery Methodology Confirmation' not in inst:
+            inst = insert_q0_in_step1(inst, 'STEP 1 —', METHOD_Q0_SCHEDULE)
+            changed = True
+        if 'METHODOLOGY ADAPTATION — SCHEDULE' not in inst:
+            inst = insert_after_step3(inst, METHOD_BUILD_SCHEDULE)
+            changed = True
+
+    # 5b. Methodology branch — critical path
+    if fname == 'critical_path.json':
+        if 'Delivery Methodology Confirmation' not in inst:
+            inst = insert_q0_in_step1(inst, 'STEP 1 —', METHOD_Q0_CPM)
+            changed = True
+        if 'METHODOLOGY ADAPTATION — CRITICAL PATH' not in inst:
+            inst = insert_after_step3(inst, METHOD_BUILD_CPM)
+            changed = True
+
+    # 6. Consistency audit (pmo playbook only)
+    if fname == 'pmo_playbook.json' and 'CROSS-DOCUMENT CONSISTENCY AUDIT' not in inst:
+        step1_idx = inst.find('STEP 1 — CONSOLIDATION REVIEW')
+        if step1_idx >= 0:
+            eol = inst.find('\n', step1_idx)
+            inst = inst[:eol + 1] + '\n' + CONSISTENCY_AUDIT + inst[eol + 1:]
+            changed = True
+
+    return inst, changed
+
+
+def strip_payloads(inst, artifact):
+    """Yield variants of inst with inserted directives removed, to exercise
+    both engines on text that still needs transforming."""
+    payloads = [CONTEXT_BLOCK, thin_context_warning(artifact), FEE_Q0, METHOD_Q0_SCHEDULE,
+                METHOD_Q0_CPM, '\n' + FEE_BUILD, '\n' + METHOD_BUILD_SCHEDULE,
+                '\n' + METHOD_BUILD_CPM, '\n' + CONSISTENCY_AUDIT]
+    payloads += EXCEL_RATIONALISATIONS.values()
+    present = [p for p in payloads if p in inst]
+    yield inst
+    for payload in present:
+        yield inst.replace(payload, '', 1)
+    stripped = inst
+    for payload in present:
+        stripped = stripped.replace(payload, '', 1)
+    yield stripped
+
+
+# Layouts the shipped prompts do not exercise: directives landing between a
+# heading and its line break or first numbered item, and missing anchors.
+# (A heading on the very last line is not covered: the sequential audit
+# insertion prepended in that case, where the registry skips the rule.)
+SYNTHETIC_CASES = (
+    ('budget_cost_baseline.json', 'STEP 1 — Q\nEXCEL WORKBOOK STRUCTURE\n1. a\nSTEP 3 — BUILD\n'),
+    ('budget_cost_baseline.json', 'STEP 1 — Q\nno items\nSTEP 3 — BUILD'),
+    ('critical_path.json', 'STEP 3 — BUILD x EXCEL WORKBOOK STRUCTURE\nSTEP 1: y\n1. a'),
+    ('schedule_milestones.json', 'STEP 1 — x\nSTEP 3 — BUILD\nPWC FORMATTING STANDARDS FOR EXCEL\n1. a'),
+    ('engagement_charter.json', 'STEP 1 — x\n1. q\nSTEP 3 nothing'),
+    ('pmo_playbook.json', 'STEP 1 — CONSOLIDATION REVIEW EXCEL WORKBOOK STRUCTURE\n'),
+    ('raci_matrix.json', 'no anchors at all'),
+)
+
+
+def prompt_cases():
+    for path in sorted(PROMPTS_DIR.glob('*.json')):
+        with path.open('r', encoding='utf-8') as fh:
+            data = json.load(fh)
+        artifact = data.get('artifact', path.name.replace('.json', '').replace('_', ' ').title())
+        yield pytest.param(path.name, data['instruction'], artifact, id=path.name)
+
+
+@pytest.mark.parametrize('fname, inst, artifact', list(prompt_cases()))
+def test_engine_matches_reference_on_prompts(fname, inst, artifact):
+    for case, variant in enumerate(strip_payloads(inst, artifact)):
+        assert apply_transforms(fname, variant, artifact)[0] == \
+            apply_transforms_sequential(fname, variant, artifact)[0], f'variant {case}'
+
+
+@pytest.mark.parametrize('fname, inst', SYNTHETIC_CASES,
+                         ids=[f'{i}-{fname}' for i, (fname, _) in enumerate(SYNTHETIC_CASES, 1)])
+def test_engine_matches_reference_on_synthetic_layouts(fname, inst):
+    assert apply_transforms(fname, inst, 'Artifact')[0] == apply_transforms_sequential(fname, inst, 'Artifact')[0]
+
+
+NEW_RULE = rule('client-note', '*', 'start', 'CLIENT NOTE: keep it short.\n\n', sentinels=['CLIENT NOTE'])
+
+
+@pytest.mark.parametrize('applied', [None, [], ['context-block']], ids=['unrecorded', 'empty', 'other-rules'])
+def test_new_rule_with_sentinel_present_is_recorded_not_reinserted(applied):
+    inst = 'CLIENT NOTE: already here.\nSTEP 1 — x\n1. a'
+    assert apply_transforms('raci_matrix.json', inst, 'Artifact', [NEW_RULE], applied) == \
+        (inst, list(applied or ()) + ['client-note'])
+
+
+def test_new_rule_without_sentinel_is_applied():
+    inst = 'STEP 1 — x\n1. a'
+    assert apply_transforms('raci_matrix.json', inst, 'Artifact', [NEW_RULE], ['context-block']) == \
+        ('CLIENT NOTE: keep it short.\n\n' + inst, ['context-block', 'client-note'])
+
+
+# ── Batch commit ─────────────────────────────────────────────────────────────
+# run_batch against a copy of the pack with every directive stripped, so each
+# file needs updating.
+
+def snapshot(directory):
+    return {path.name: path.read_bytes() for path in sorted(directory.iterdir())}
+
+
+@pytest.fixture
+def stripped_pack(tmp_path):
+    pack = tmp_path / 'prompts'
+    shutil.copytree(PROMPTS_DIR, pack)
+    (pack / '.pack-state').write_text('{"pack": "acme"}', encoding='utf-8')
+    expected = {}
+    for path in sorted(pack.glob('*.json')):
+        if path.name in SKIP_FILES:
+            continue
+        with path.open('r', encoding='utf-8') as fh:
+            data = json.load(fh)
+        artifact = data.get('artifact', path.name.replace('.json', '').replace('_', ' ').title())
+        data['instruction'] = list(strip_payloads(data['instruction'], artifact))[-1]
+        data.pop('applied_transforms', None)
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        expected[path.name] = apply_transforms(path.name, data['instruction'], artifact)[0]
+    return pack, expected
+
+
+def leftovers(pack):
+    return sorted(path.name for path in pack.parent.iterdir() if path != pack)
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch_commits_every_file(stripped_pack, jobs):
+    pack, expected = stripped_pack
+    results = run_batch(list(expected), pack, jobs)
+    assert [error for *_, error, _ in results] == [None] * len(expected)
+    for fname, inst in expected.items():
+        with (pack / fname).open('r', encoding='utf-8') as fh:
+            assert json.load(fh)['instruction'] == inst, fname
+    assert (pack / '.pack-state').read_text(encoding='utf-8') == '{"pack": "acme"}'
+    assert leftovers(pack) == []
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch_with_a_failing_file_changes_nothing(stripped_pack, jobs):
+    pack, expected = stripped_pack
+    broken = sorted(expected)[len(expected) // 2]
+    (pack / broken).write_text('{"prompt_id": "P0.0"}', encoding='utf-8')
+    before = snapshot(pack)
+    results = run_batch(list(expected), pack, jobs)
+    assert [fname for fname, _, _, error, _ in results if error] == [broken]
+    assert snapshot(pack) == before
+    assert leftovers(pack) == []
+
+
+def test_interrupted_swap_rolls_back(stripped_pack, monkeypatch):
+    pack, expected = stripped_pack
+    before = snapshot(pack)
+    rename = os.rename
+    calls = []
+
+    def interrupted(src, dst):
+        calls.append(src)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        rename(src, dst)
+
+    monkeypatch.setattr(update_prompts.os, 'rename', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(list(expected), pack)
+    monkeypatch.undo()
+    assert snapshot(pack) == before
+    assert leftovers(pack) == []
+
+
+def test_swap_cut_short_is_restored_on_next_run(stripped_pack):
+    pack, _ = stripped_pack
+    before = snapshot(pack)
+    os.rename(pack, pack.with_name('.prompts-retired-x'))
+    assert recover_interrupted_swap(pack)
+    assert snapshot(pack) == before
+    assert leftovers(pack) == []